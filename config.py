@@ -1,24 +1,36 @@
+import functools
 import os
-from typing import Optional
+from dataclasses import dataclass
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
-class Config:
-    def __init__(self) -> None:
-        # Load environment variables
+# .env is parsed once per process; later reads go through the snapshot
+_LOADED = False
+_ENV: Dict[str, str] = {}
+
+def _load_env() -> Dict[str, str]:
+    """Load .env on first call and return a snapshot of the environment"""
+    global _LOADED, _ENV
+    if not _LOADED:
         load_dotenv()
-        
-        # Spotify configuration
-        self.client_id: Optional[str] = os.getenv('SPOTIFY_CLIENT_ID')
-        self.client_secret: Optional[str] = os.getenv('SPOTIFY_CLIENT_SECRET')
-        self.redirect_uri: str = os.getenv('SPOTIFY_REDIRECT_URI', 'http://localhost:8888/callback')
-        self.scope: str = 'user-top-read playlist-modify-public playlist-modify-private'
-        
-        # GetSongBPM configuration
-        self.getsongbpm_api_key: Optional[str] = os.getenv('GETSONGBPM_API_KEY')
-        
-        # Last.fm configuration (removed - using AcousticBrainz instead)
-        # AcousticBrainz doesn't require API keys
-    
+        _ENV = dict(os.environ)
+        _LOADED = True
+    return _ENV
+
+@dataclass(frozen=True)
+class Config:
+    # Spotify configuration
+    client_id: Optional[str]
+    client_secret: Optional[str]
+    redirect_uri: str = 'http://localhost:8888/callback'
+    scope: str = 'user-top-read playlist-modify-public playlist-modify-private'
+
+    # GetSongBPM configuration
+    getsongbpm_api_key: Optional[str] = None
+
+    # Last.fm configuration (removed - using AcousticBrainz instead)
+    # AcousticBrainz doesn't require API keys
+
     def validate(self) -> bool:
         """Validate that all required credentials are present"""
         if not all([self.client_id, self.client_secret]):
@@ -27,15 +39,26 @@ class Config:
                 missing.append("SPOTIFY_CLIENT_ID")
             if not self.client_secret:
                 missing.append("SPOTIFY_CLIENT_SECRET")
-            
+
             raise ValueError(f"Missing required Spotify environment variables: {', '.join(missing)}")
-        
+
         return True
-    
+
     def has_acousticbrainz_config(self) -> bool:
         """Check if AcousticBrainz is available (always true - no API keys needed)"""
         return True
-    
+
     def has_getsongbpm_config(self) -> bool:
         """Check if GetSongBPM API key is configured"""
         return bool(self.getsongbpm_api_key and self.getsongbpm_api_key != 'your_api_key_here')
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Build the application configuration once and return the shared instance"""
+    env = _load_env()
+    return Config(
+        client_id=env.get('SPOTIFY_CLIENT_ID'),
+        client_secret=env.get('SPOTIFY_CLIENT_SECRET'),
+        redirect_uri=env.get('SPOTIFY_REDIRECT_URI', 'http://localhost:8888/callback'),
+        getsongbpm_api_key=env.get('GETSONGBPM_API_KEY')
+    )
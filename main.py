@@ -2,22 +2,35 @@
 Tempo Craft - Spotify BPM Playlist Creator
 Simple main entry point with AcousticBrainz fallback support
 """
-from config import Config
+from collections import Counter
+from config import get_config
 from src.auth.spotify_auth import SpotifyAuth
 from src.models.track import Track
 from src.analyzer.music_analyzer import MusicAnalyzer
 from src.analyzer.acousticbrainz_analyzer import AcousticBrainzAnalyzer
+from src.analyzer._cache import Cache
 from src.analyzer.getsongbpm_analyzer import GetSongBPMAnalyzer
 from src.exceptions.exception_handler import ExceptionHandler
 from src.exceptions.track_exceptions import TrackParsingError, TrackValidationError
 from src.exceptions.spotify_exceptions import SpotifyConnectionError, SpotifyAuthenticationError
 from src.exceptions.analysis_exceptions import ExternalAPIError
 
+# Fields every Spotify track item must carry to become a Track
+_REQUIRED_FIELDS = frozenset({'id', 'name', 'uri', 'popularity', 'artists'})
+
 def main():
+    # Open the lookup cache once, share it for the whole run and close it on exit
+    with Cache() as cache:
+        _run(cache)
+
+def _run(cache: Cache) -> None:
     print("🎵 Tempo Craft - Spotify BPM Playlist Creator")
     
     # Initialize configuration
-    config = Config()
+    config = get_config()
+    
+    # Created before connecting so its availability probe overlaps Spotify auth
+    acousticbrainz_analyzer = AcousticBrainzAnalyzer(cache=cache)
     
     # Step 1: Connect to Spotify
     try:
@@ -39,9 +52,8 @@ def main():
         return
 
     # Create main analyzer with AcousticBrainz and GetSongBPM fallbacks
-    acousticbrainz_analyzer = AcousticBrainzAnalyzer()
-    getsongbpm_analyzer = GetSongBPMAnalyzer(config.getsongbpm_api_key)
-    analyzer = MusicAnalyzer(sp, acousticbrainz_analyzer, getsongbpm_analyzer)
+    getsongbpm_analyzer = GetSongBPMAnalyzer(config.getsongbpm_api_key, cache=cache)
+    analyzer = MusicAnalyzer(sp, acousticbrainz_analyzer, getsongbpm_analyzer, cache=cache)
 
     # Show fallback status
     fallback_status = analyzer.get_fallback_status()
@@ -68,18 +80,18 @@ def main():
     for i, spotify_track in enumerate(top_tracks, 1):
         try:
             # Check if required fields exist
-            required_fields = ['id', 'name', 'uri', 'popularity', 'artists']
-            if not all(key in spotify_track for key in required_fields):
-                missing = [key for key in required_fields if key not in spotify_track]
-                raise TrackParsingError(f"Missing required fields: {missing}")
+            missing = _REQUIRED_FIELDS - spotify_track.keys()
+            if missing:
+                raise TrackParsingError(f"Missing required fields: {sorted(missing)}")
             
-            if not spotify_track['artists'] or 'name' not in spotify_track['artists'][0]:
+            artists = spotify_track['artists']
+            if not artists or 'name' not in artists[0]:
                 raise TrackParsingError("Missing artist information")
             
             track = Track(
                 id=spotify_track['id'],
                 name=spotify_track['name'],
-                artist=spotify_track['artists'][0]['name'],
+                artist=artists[0]['name'],
                 uri=spotify_track['uri'],
                 popularity=spotify_track['popularity']
             )
@@ -95,24 +107,19 @@ def main():
     
     # Step 6: Display results
     print("\n📊 Analysis Results:")
-    for i, track in enumerate(analyzed_tracks, 1):
-        print(f"\n{i}. {track}")
-        print(f"   ID: {track.id}")
-        print(f"   Popularity: {track.popularity}")
-        print(f"   BPM: {track.bpm}" + (f" (from {track.bpm_source})" if track.bpm_source else ""))
-        print(f"   Genres: {', '.join(track.genres) if track.genres else 'None'}")
+    if analyzed_tracks:
+        print("\n".join(f"\n{i}. {track.summary()}" for i, track in enumerate(analyzed_tracks, 1)))
     
     print(f"\n✅ Successfully analyzed {len(analyzed_tracks)} out of {len(tracks)} tracks!")
     
     # Show summary
-    bpm_tracks = [t for t in analyzed_tracks if t.bpm is not None]
-    spotify_bpm = [t for t in bpm_tracks if t.bpm_source == "spotify"]
-    acousticbrainz_bpm = [t for t in bpm_tracks if t.bpm_source == "acousticbrainz"]
+    bpm_counts = Counter(t.bpm_source for t in analyzed_tracks if t.bpm is not None)
     
     print(f"\n📈 BPM Analysis Summary:")
-    print(f"   Total tracks with BPM: {len(bpm_tracks)}")
-    print(f"   From Spotify: {len(spotify_bpm)}")
-    print(f"   From AcousticBrainz: {len(acousticbrainz_bpm)}")
+    print(f"   Total tracks with BPM: {sum(bpm_counts.values())}")
+    print(f"   From Spotify: {bpm_counts['spotify']}")
+    print(f"   From AcousticBrainz: {bpm_counts['acousticbrainz']}")
+    print(f"   From GetSongBPM: {bpm_counts['getsongbpm']}")
 
 if __name__ == "__main__":
     main()
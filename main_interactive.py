@@ -10,12 +10,14 @@ Enhanced version with playlist creation ca        # Show analysis summary
     acousticbrainz_bpm = [t for t in bpm_tracks if t.bmp_source == "acousticbrainz"]
     getsongbpm_bpm = [t for t in bpm_tracks if t.bpm_source == "getsongbpm"]ities
 """
+from collections import Counter
 from typing import List, Optional
-from config import Config
+from config import get_config
 from src.auth.spotify_auth import SpotifyAuth
 from src.models.track import Track
 from src.analyzer.music_analyzer import MusicAnalyzer
 from src.analyzer.acousticbrainz_analyzer import AcousticBrainzAnalyzer
+from src.analyzer._cache import Cache
 from src.analyzer.getsongbpm_analyzer import GetSongBPMAnalyzer
 from src.playlist.playlist_manager import PlaylistManager
 from user_interface import UserInterface
@@ -24,12 +26,23 @@ from src.exceptions.track_exceptions import TrackParsingError, TrackValidationEr
 from src.exceptions.spotify_exceptions import SpotifyConnectionError, SpotifyAuthenticationError
 from src.exceptions.analysis_exceptions import ExternalAPIError
 
+# Fields every Spotify track item must carry to become a Track
+_REQUIRED_FIELDS = frozenset({'id', 'name', 'uri', 'popularity', 'artists'})
+
 def main() -> None:
+    # Open the lookup cache once, share it for the whole run and close it on exit
+    with Cache() as cache:
+        _run(cache)
+
+def _run(cache: Cache) -> None:
     # Display welcome
     UserInterface.display_welcome()
     
     # Initialize configuration
-    config = Config()
+    config = get_config()
+    
+    # Created before connecting so its availability probe overlaps Spotify auth
+    acousticbrainz_analyzer = AcousticBrainzAnalyzer(cache=cache)
     
     # Step 1: Connect to Spotify
     try:
@@ -51,9 +64,8 @@ def main() -> None:
         return
 
     # Create analyzers (re-enable GetSongBPM with corrected API)
-    acousticbrainz_analyzer = AcousticBrainzAnalyzer()
-    getsongbpm_analyzer = GetSongBPMAnalyzer(config.getsongbpm_api_key)
-    analyzer = MusicAnalyzer(sp, acousticbrainz_analyzer, getsongbpm_analyzer)
+    getsongbpm_analyzer = GetSongBPMAnalyzer(config.getsongbpm_api_key, cache=cache)
+    analyzer = MusicAnalyzer(sp, acousticbrainz_analyzer, getsongbpm_analyzer, cache=cache)
     
     # Create playlist manager
     playlist_manager = PlaylistManager(sp)
@@ -83,18 +95,18 @@ def main() -> None:
     for i, spotify_track in enumerate(top_tracks, 1):
         try:
             # Check if required fields exist
-            required_fields = ['id', 'name', 'uri', 'popularity', 'artists']
-            if not all(key in spotify_track for key in required_fields):
-                missing = [key for key in required_fields if key not in spotify_track]
-                raise TrackParsingError(f"Missing required fields: {missing}")
+            missing = _REQUIRED_FIELDS - spotify_track.keys()
+            if missing:
+                raise TrackParsingError(f"Missing required fields: {sorted(missing)}")
             
-            if not spotify_track['artists'] or 'name' not in spotify_track['artists'][0]:
+            artists = spotify_track['artists']
+            if not artists or 'name' not in artists[0]:
                 raise TrackParsingError("Missing artist information")
             
             track = Track(
                 id=spotify_track['id'],
                 name=spotify_track['name'],
-                artist=spotify_track['artists'][0]['name'],
+                artist=artists[0]['name'],
                 uri=spotify_track['uri'],
                 popularity=spotify_track['popularity']
             )
@@ -109,19 +121,17 @@ def main() -> None:
     analyzed_tracks = analyzer.analyze_tracks(tracks)
     
     # Show analysis summary
-    bpm_tracks = [t for t in analyzed_tracks if t.bpm is not None]
-    spotify_bpm = [t for t in bpm_tracks if t.bpm_source == "spotify"]
-    acousticbrainz_bpm = [t for t in bpm_tracks if t.bpm_source == "acousticbrainz"]
-    getsongbpm_bpm = [t for t in bpm_tracks if t.bpm_source == "getsongbpm"]
+    bpm_counts = Counter(t.bpm_source for t in analyzed_tracks if t.bpm is not None)
+    bpm_track_count = sum(bpm_counts.values())
     
     print(f"\n📊 Analysis Complete!")
     print(f"   Total tracks analyzed: {len(analyzed_tracks)}")
-    print(f"   Tracks with BPM: {len(bpm_tracks)}")
-    print(f"   From Spotify: {len(spotify_bpm)}")
-    print(f"   From AcousticBrainz: {len(acousticbrainz_bpm)}")
-    print(f"   From GetSongBPM: {len(getsongbpm_bpm)}")
+    print(f"   Tracks with BPM: {bpm_track_count}")
+    print(f"   From Spotify: {bpm_counts['spotify']}")
+    print(f"   From AcousticBrainz: {bpm_counts['acousticbrainz']}")
+    print(f"   From GetSongBPM: {bpm_counts['getsongbpm']}")
     
-    if len(bpm_tracks) == 0:
+    if bpm_track_count == 0:
         print("\n❌ No tracks with BPM data found. Cannot create playlist.")
         return
     
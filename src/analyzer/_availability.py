@@ -0,0 +1,28 @@
+"""
+Cached, thread-safe availability checks for external APIs
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+# How long an availability probe result is reused, in seconds
+AVAILABILITY_TTL = 300.0
+
+class AvailabilityCheck:
+    """Runs a probe at most once per ttl seconds and shares its result between threads"""
+
+    def __init__(self, probe: Callable[[], bool], ttl: float = AVAILABILITY_TTL) -> None:
+        self._probe = probe
+        self._ttl = ttl
+        self._available: Optional[bool] = None
+        self._checked_at = 0.0
+        # Concurrent callers wait for the running probe instead of starting their own
+        self._lock = threading.Lock()
+
+    def __call__(self) -> bool:
+        """Return the last probe result, probing again once it is older than ttl"""
+        with self._lock:
+            if self._available is None or time.monotonic() - self._checked_at > self._ttl:
+                self._available = self._probe()
+                self._checked_at = time.monotonic()
+            return self._available
@@ -0,0 +1,148 @@
+"""
+Persistent SQLite-backed cache for external API lookups
+"""
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple, Type
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'tempo-craft', 'lookups.sqlite')
+
+# Returned by Cache.get on a miss, so a cached None can be told apart from no entry
+MISSING = object()
+
+# Key marking a cached entry as a remembered exception rather than a result
+_RAISED = '__raised__'
+
+class Cache:
+    """Tiny key/value store with per-entry timestamps, safe to share between threads"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH) -> None:
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, ts INTEGER)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str, ttl: Optional[int] = None) -> Any:
+        """Return the cached value for key, or MISSING if absent or older than ttl seconds"""
+        with self._lock:
+            row = self._conn.execute("SELECT value, ts FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return MISSING
+        value, ts = row
+        if ttl is not None and time.time() - ts > ttl:
+            return MISSING
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value (None included) under key"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+                (key, json.dumps(value), int(time.time()))
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> 'Cache':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def make_key(namespace: str, args: Tuple[Any, ...]) -> str:
+    """Build a cache key from a namespace and case/whitespace-normalized arguments"""
+    return '\x1f'.join([namespace, *(str(arg).lower().strip() for arg in args)])
+
+def _lookup(cache: Cache, key: str, ttl: Optional[int],
+            negative: Tuple[Type[Exception], ...]) -> Any:
+    """Cached result for key or MISSING, re-raising a remembered negative exception"""
+    value = cache.get(key, ttl)
+    if negative and isinstance(value, dict) and _RAISED in value:
+        for error in negative:
+            if error.__name__ == value[_RAISED]:
+                raise error(value['message'])
+        # Remembered under an exception type that is no longer cached
+        return MISSING
+    return value
+
+def _remember(cache: Cache, key: str, error: Exception) -> None:
+    """Store a negative exception so later hits raise it again"""
+    cache.set(key, {_RAISED: type(error).__name__, 'message': str(error)})
+
+def cached(namespace: str, ttl: Optional[int] = None,
+           negative: Tuple[Type[Exception], ...] = (),
+           cache_if: Optional[Callable[[Any], bool]] = None) -> Callable:
+    """
+    Cache a method's result in ``self.cache`` (no-op when it is None)
+
+    Works for both sync and async methods; sync and async variants sharing a
+    namespace share entries. Arguments must be passed positionally.
+
+    Args:
+        namespace: Key prefix identifying the lookup
+        ttl: Maximum entry age in seconds, None for no expiry
+        negative: Exceptions that are cached and raised again on later hits
+        cache_if: Predicate deciding whether a returned value is stored
+    """
+    def should_store(value: Any) -> bool:
+        return cache_if is None or cache_if(value)
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self: Any, *args: Any) -> Any:
+                cache: Optional[Cache] = self.cache
+                if cache is None:
+                    return await func(self, *args)
+
+                key = make_key(namespace, args)
+                value = _lookup(cache, key, ttl, negative)
+                if value is not MISSING:
+                    return value
+
+                try:
+                    value = await func(self, *args)
+                except negative as e:
+                    _remember(cache, key, e)
+                    raise
+                if should_store(value):
+                    cache.set(key, value)
+                return value
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self: Any, *args: Any) -> Any:
+            cache: Optional[Cache] = self.cache
+            if cache is None:
+                return func(self, *args)
+
+            key = make_key(namespace, args)
+            value = _lookup(cache, key, ttl, negative)
+            if value is not MISSING:
+                return value
+
+            try:
+                value = func(self, *args)
+            except negative as e:
+                _remember(cache, key, e)
+                raise
+            if should_store(value):
+                cache.set(key, value)
+            return value
+        return wrapper
+
+    return decorator
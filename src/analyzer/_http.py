@@ -0,0 +1,46 @@
+"""
+Shared aiohttp session and rate limiters for analyzers with an async path
+"""
+from typing import Dict, Mapping, Optional, Tuple
+import aiohttp
+from aiolimiter import AsyncLimiter
+
+# Total time allowed for one async request, in seconds
+ASYNC_REQUEST_TIMEOUT = 10
+
+class AsyncHTTPClient:
+    """Lazily created aiohttp session plus per-service rate limiters, released by aclose()"""
+
+    # Documented request budgets as (max requests, per seconds), keyed by service name
+    RATE_LIMITS: Mapping[str, Tuple[float, float]] = {}
+
+    def __init__(self, headers: Mapping[str, str]) -> None:
+        self._async_headers = dict(headers)
+        # Created on first async call and reused like a requests.Session
+        self._async_session: Optional[aiohttp.ClientSession] = None
+        # Space out requests up front instead of reacting to 429s; limiters are bound
+        # to an event loop, so they live and die with the session
+        self._limiters: Dict[str, AsyncLimiter] = {}
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it on first use"""
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = aiohttp.ClientSession(
+                headers=self._async_headers,
+                timeout=aiohttp.ClientTimeout(total=ASYNC_REQUEST_TIMEOUT)
+            )
+        return self._async_session
+
+    def _get_limiter(self, service: str) -> AsyncLimiter:
+        """Get the rate limiter of a service in RATE_LIMITS, creating it on first use"""
+        limiter = self._limiters.get(service)
+        if limiter is None:
+            limiter = self._limiters[service] = AsyncLimiter(*self.RATE_LIMITS[service])
+        return limiter
+
+    async def aclose(self) -> None:
+        """Close the shared aiohttp session and drop the loop-bound rate limiters"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        self._limiters.clear()
@@ -0,0 +1,14 @@
+"""
+Fast JSON decoding for API responses, using orjson when it is installed
+"""
+from typing import Any, Callable
+
+try:
+    import orjson
+    loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    import json
+
+    def loads(data: bytes) -> Any:
+        """Decode a UTF-8 JSON payload"""
+        return json.loads(data.decode('utf-8'))
@@ -3,32 +3,158 @@ AcousticBrainz API integration for BPM and audio feature analysis.
 Provides fallback functionality when Spotify API quota is exceeded.
 """
 
+import asyncio
+import aiohttp
 import requests
 import logging
-from typing import Optional, Dict, Any, Union
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, Iterator, List, Tuple, Union
 from ..exceptions.analysis_exceptions import (
     BPMAnalysisError, 
     ExternalAPIError, 
     DataNotFoundError
 )
+from ._availability import AvailabilityCheck
+from ._http import AsyncHTTPClient
+from ._cache import Cache, MISSING, cached, make_key
+from ._json import loads
+
+try:
+    import ijson  # type: ignore[import-untyped]
+except ImportError:
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
-class AcousticBrainzAnalyzer:
+# Retry policy for 429 responses on the async path
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0
+
+# Plausible BPM range; values outside it are treated as detection errors
+_BPM_MIN, _BPM_MAX = 60.0, 200.0
+
+# BPM locations in high-level documents, in order of preference
+_HIGHLEVEL_PATHS = (('rhythm', 'bpm'), ('rhythm', 'tempo'), ('bpm',), ('tempo',))
+
+# Raw length budget for one batched MusicBrainz query, keeps the encoded URL near 2KB
+MAX_BATCH_QUERY_LENGTH = 1500
+
+# MusicBrainz caps search results per request
+MUSICBRAINZ_MAX_LIMIT = 100
+
+# Lookups are cached for 30 days, AcousticBrainz data is effectively static
+CACHE_TTL = 30 * 86400
+
+# Statuses that are a definitive answer for an MBID and safe to remember
+_DEFINITIVE_STATUSES = (200, 404)
+
+def _valid_bpm(value: Any) -> Optional[float]:
+    """Return value as a float if it is a number in the plausible BPM range"""
+    try:
+        bpm = float(value)
+    except (TypeError, ValueError):
+        return None
+    return bpm if _BPM_MIN <= bpm <= _BPM_MAX else None
+
+def _pair_key(artist: str, track_name: str) -> Tuple[str, str]:
+    """Normalize an (artist, track) pair for matching"""
+    return artist.lower().strip(), track_name.lower().strip()
+
+def _is_definitive(result: Tuple[int, Any]) -> bool:
+    """Whether a (status, payload) fetch result may be cached"""
+    return result[0] in _DEFINITIVE_STATUSES
+
+def _escape_lucene(term: str) -> str:
+    """Escape a term for use inside a quoted Lucene phrase"""
+    return term.replace('\\', '\\\\').replace('"', '\\"')
+
+def _lowlevel_event_bpm(prefix: str, event: str, value: Any) -> Optional[float]:
+    """Return the BPM carried by one ijson event of a low-level document, if any"""
+    if event != 'number':
+        return None
+    if prefix in ('rhythm.bpm', 'rhythm.tempo') or (
+            prefix.startswith('rhythm.tempo.') and prefix.count('.') == 2):
+        return _valid_bpm(value)
+    return None
+
+def _scan_lowlevel_events(events: Iterator[Tuple[str, str, Any]]) -> Optional[float]:
+    """Stop at the first rhythm BPM candidate, or once the rhythm object has been read"""
+    for prefix, event, value in events:
+        bpm = _lowlevel_event_bpm(prefix, event, value)
+        if bpm is not None:
+            return bpm
+        if prefix == 'rhythm' and event == 'end_map':
+            break
+    return None
+
+async def _ascan_lowlevel_events(events: AsyncIterator[Tuple[str, str, Any]]) -> Optional[float]:
+    """Async variant of _scan_lowlevel_events"""
+    async for prefix, event, value in events:
+        bpm = _lowlevel_event_bpm(prefix, event, value)
+        if bpm is not None:
+            return bpm
+        if prefix == 'rhythm' and event == 'end_map':
+            break
+    return None
+
+class AcousticBrainzAnalyzer(AsyncHTTPClient):
     """Handles BPM analysis using AcousticBrainz API as fallback"""
     
-    def __init__(self) -> None:
+    # MusicBrainz allows one search per second, AcousticBrainz ten requests per ten seconds
+    RATE_LIMITS = {'musicbrainz': (1, 1.0), 'acousticbrainz': (10, 10.0)}
+    
+    def __init__(self, cache: Optional[Cache] = None, probe_availability: bool = True) -> None:
         """
         Initialize AcousticBrainz analyzer
         
         AcousticBrainz doesn't require API keys - it's a free service
+        
+        Args:
+            cache: Optional persistent cache for MBID and BPM lookups
+            probe_availability: Start the availability check in a background thread
         """
+        self.cache = cache
         self.base_url = "https://acousticbrainz.org"
+        self.musicbrainz_search_url = "https://musicbrainz.org/ws/2/recording"
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'TempoCraft/1.0 (BPM Analysis Tool)'
+            'User-Agent': 'TempoCraft/1.0 (BPM Analysis Tool)',
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        
+        # Keep connections alive per host and retry transient failures;
+        # the final response is still returned so status handling below applies
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://acousticbrainz.org', adapter)
+        self.session.mount('https://musicbrainz.org', adapter)
+        # MBIDs resolved by search_mbids_batch, keyed by normalized (artist, track)
+        self._batch_mbids: Dict[Tuple[str, str], str] = {}
+        # Per-MBID fetch results shared by the BPM and track info lookups
+        self._highlevel_docs: Dict[str, Tuple[int, Optional[Dict[str, Any]]]] = {}
+        self._lowlevel_bpms: Dict[str, Tuple[int, Optional[float]]] = {}
+        super().__init__({
+            'User-Agent': str(self.session.headers['User-Agent']),
+            'Accept': 'application/json'
         })
+        
+        self._availability = AvailabilityCheck(self._probe_availability)
+        if probe_availability:
+            # Overlaps the probe with whatever the caller does next (e.g. Spotify auth)
+            threading.Thread(target=self.is_available, daemon=True).start()
     
+    @cached('bpm', ttl=CACHE_TTL, negative=(DataNotFoundError,))
     def get_track_bpm_by_mbid(self, mbid: str) -> Optional[float]:
         """
         Get BPM for a track using MusicBrainz ID (MBID)
@@ -44,42 +170,46 @@ class AcousticBrainzAnalyzer:
             DataNotFoundError: If track not found
         """
         try:
-            # Try high-level data first (more reliable)
-            url = f"{self.base_url}/{mbid}/high-level"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                bpm = self._extract_bpm_from_highlevel(data)
-                if bpm:
-                    logger.info(f"Found BPM {bpm} for MBID {mbid} via AcousticBrainz high-level")
-                    return bpm
-            
-            # Try low-level data as fallback
-            url = f"{self.base_url}/{mbid}/low-level"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                bpm = self._extract_bpm_from_lowlevel(data)
-                if bpm:
-                    logger.info(f"Found BPM {bpm} for MBID {mbid} via AcousticBrainz low-level")
-                    return bpm
-            elif response.status_code == 404:
-                raise DataNotFoundError(f"Track with MBID {mbid} not found in AcousticBrainz")
-            else:
-                raise ExternalAPIError(f"AcousticBrainz API error: {response.status_code}")
-            
-            logger.warning(f"No BPM found for MBID {mbid} in AcousticBrainz")
-            return None
+            # Try high-level data first (more reliable), low-level data as fallback
+            bpm = self._bpm_from_highlevel(mbid, self._fetch_highlevel(mbid))
+            if bpm:
+                return bpm
+            return self._bpm_from_lowlevel(mbid, self._fetch_lowlevel_bpm(mbid))
             
+        except (DataNotFoundError, ExternalAPIError):
+            raise
         except requests.exceptions.RequestException as e:
-            logger.error(f"Network error accessing AcousticBrainz: {e}")
+            logger.error("Network error accessing AcousticBrainz: %s", e)
             raise ExternalAPIError(f"Failed to connect to AcousticBrainz: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error getting BPM from AcousticBrainz: {e}")
+            logger.error("Unexpected error getting BPM from AcousticBrainz: %s", e)
             raise BPMAnalysisError(f"Failed to analyze BPM via AcousticBrainz: {str(e)}")
     
+    def _bpm_from_highlevel(self, mbid: str,
+                            result: Tuple[int, Optional[Dict[str, Any]]]) -> Optional[float]:
+        """BPM from a high-level fetch result, None when the document is missing or has none"""
+        _, data = result
+        if data is None:
+            return None
+        bpm = self._extract_bpm_from_highlevel(data)
+        if bpm:
+            logger.info("Found BPM %s for MBID %s via AcousticBrainz high-level", bpm, mbid)
+        return bpm
+    
+    def _bpm_from_lowlevel(self, mbid: str, result: Tuple[int, Optional[float]]) -> Optional[float]:
+        """BPM from a low-level fetch result, raising for statuses other than 200"""
+        status, bpm = result
+        if status == 404:
+            raise DataNotFoundError(f"Track with MBID {mbid} not found in AcousticBrainz")
+        if status != 200:
+            raise ExternalAPIError(f"AcousticBrainz API error: {status}")
+        
+        if bpm:
+            logger.info("Found BPM %s for MBID %s via AcousticBrainz low-level", bpm, mbid)
+        else:
+            logger.warning("No BPM found for MBID %s in AcousticBrainz", mbid)
+        return bpm
+    
     def search_mbid_by_track(self, artist: str, track_name: str) -> Optional[str]:
         """
         Search for MusicBrainz ID using artist and track name
@@ -92,33 +222,111 @@ class AcousticBrainzAnalyzer:
             MusicBrainz ID if found, None otherwise
         """
         try:
-            # Use MusicBrainz search API
-            search_url = "https://musicbrainz.org/ws/2/recording"
+            return self._search_mbid(artist, track_name)
+        except Exception as e:
+            logger.error("Error searching MBID: %s", e)
+            return None
+    
+    @cached('mbid', ttl=CACHE_TTL)
+    def _search_mbid(self, artist: str, track_name: str) -> Optional[str]:
+        """Query MusicBrainz for an MBID, raising on request failures so they aren't cached"""
+        known = self._batch_mbids.get(_pair_key(artist, track_name))
+        if known:
+            return known
+        
+        # Use MusicBrainz search API
+        params = self._mbid_search_params(artist, track_name)
+        response = self.session.get(self.musicbrainz_search_url, params=params, timeout=10)
+        response.raise_for_status()
+        return self._mbid_from_search(loads(response.content), artist, track_name)
+    
+    def _mbid_from_search(self, data: Dict[str, Any], artist: str, track_name: str) -> Optional[str]:
+        """Pick the MBID of the best recording from a MusicBrainz search response"""
+        for recording in data.get('recordings', []):
+            # Get the best match (first result is usually most accurate)
+            mbid = recording.get('id')
+            if mbid:
+                logger.info("Found MBID %s for %s - %s", mbid, artist, track_name)
+                return mbid
+        
+        logger.warning("No MBID found for %s - %s", artist, track_name)
+        return None
+    
+    def search_mbids_batch(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """
+        Resolve MBIDs for many tracks with OR-combined MusicBrainz queries
+        
+        Pairs already in the cache are skipped. Matches are remembered so later
+        search_mbid_by_track calls for the same track need no request.
+        
+        Args:
+            pairs: (artist, track name) tuples
+            
+        Returns:
+            Mapping from each matched (artist, track name) pair to its MBID
+        """
+        pending = [
+            pair for pair in dict.fromkeys(pairs)
+            if _pair_key(*pair) not in self._batch_mbids
+            and (self.cache is None or self.cache.get(make_key('mbid', pair), CACHE_TTL) is MISSING)
+        ]
+        
+        found: Dict[Tuple[str, str], str] = {}
+        for chunk in self._chunk_batch_queries(pending):
+            query = ' OR '.join(self._mbid_search_clause(artist, track_name) for artist, track_name in chunk)
             params = {
-                'query': f'artist:"{artist}" AND recording:"{track_name}"',
+                'query': query,
                 'fmt': 'json',
-                'limit': 5
+                'limit': str(min(len(chunk) * 3, MUSICBRAINZ_MAX_LIMIT))
             }
+            try:
+                response = self.session.get(self.musicbrainz_search_url, params=params, timeout=10)
+                response.raise_for_status()
+                recordings = loads(response.content).get('recordings', [])
+            except Exception as e:
+                logger.error("Error in batched MBID search: %s", e)
+                continue
             
-            response = self.session.get(search_url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                recordings = data.get('recordings', [])
-                
-                for recording in recordings:
-                    # Get the best match (first result is usually most accurate)
-                    mbid = recording.get('id')
-                    if mbid:
-                        logger.info(f"Found MBID {mbid} for {artist} - {track_name}")
-                        return mbid
-            
-            logger.warning(f"No MBID found for {artist} - {track_name}")
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error searching MBID: {e}")
-            return None
+            wanted = {_pair_key(*pair): pair for pair in chunk}
+            for recording in recordings:
+                credits = recording.get('artist-credit') or [{}]
+                key = _pair_key(credits[0].get('name', ''), recording.get('title', ''))
+                pair = wanted.pop(key, None)
+                if pair and recording.get('id'):
+                    found[pair] = recording['id']
+                    self._batch_mbids[key] = recording['id']
+        
+        logger.info("Resolved %s of %s MBIDs via batched search", len(found), len(pending))
+        return found
+    
+    def _chunk_batch_queries(self, pairs: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Split pairs into groups whose OR query stays within MAX_BATCH_QUERY_LENGTH"""
+        chunks: List[List[Tuple[str, str]]] = []
+        current: List[Tuple[str, str]] = []
+        length = 0
+        for artist, track_name in pairs:
+            clause_length = len(self._mbid_search_clause(artist, track_name)) + len(' OR ')
+            if current and (length + clause_length > MAX_BATCH_QUERY_LENGTH
+                            or (len(current) + 1) * 3 > MUSICBRAINZ_MAX_LIMIT):
+                chunks.append(current)
+                current, length = [], 0
+            current.append((artist, track_name))
+            length += clause_length
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _mbid_search_clause(self, artist: str, track_name: str) -> str:
+        """Build the Lucene clause matching one recording"""
+        return f'(artist:"{_escape_lucene(artist)}" AND recording:"{_escape_lucene(track_name)}")'
+    
+    def _mbid_search_params(self, artist: str, track_name: str) -> Dict[str, str]:
+        """Build MusicBrainz recording search parameters"""
+        return {
+            'query': f'artist:"{_escape_lucene(artist)}" AND recording:"{_escape_lucene(track_name)}"',
+            'fmt': 'json',
+            'limit': '5'
+        }
     
     def get_track_bpm(self, artist: str, track_name: str) -> Optional[float]:
         """
@@ -139,35 +347,158 @@ class AcousticBrainzAnalyzer:
         # Then get BPM using the MBID
         return self.get_track_bpm_by_mbid(mbid)
     
-    def _extract_bpm_from_highlevel(self, data: Dict[str, Any]) -> Optional[float]:
-        """Extract BPM from high-level AcousticBrainz data"""
-        try:
-            # High-level data contains rhythm descriptors
-            rhythm = data.get('rhythm', {})
+    async def _aget(self, url: str, params: Optional[Dict[str, str]],
+                    read: Callable[[aiohttp.ClientResponse], Awaitable[Any]]) -> Tuple[int, Any]:
+        """
+        GET a resource, backing off exponentially on 429 responses
+        
+        Args:
+            url: Resource URL
+            params: Optional query parameters
+            read: Coroutine turning a 200 response into a result
             
-            # Look for BPM in various fields
-            bpm_fields = ['bpm', 'tempo', 'rhythm.bpm']
+        Returns:
+            Tuple of (HTTP status, result of read or None when status is not 200)
             
-            for field in bpm_fields:
-                if '.' in field:
-                    # Nested field access
-                    parts = field.split('.')
-                    value = data
-                    for part in parts:
-                        value = value.get(part, {})
-                    if isinstance(value, (int, float)) and 60 <= value <= 200:
-                        return float(value)
-                else:
-                    # Direct field access
-                    value = rhythm.get(field)
-                    if isinstance(value, (int, float)) and 60 <= value <= 200:
-                        return float(value)
+        Raises:
+            aiohttp.ClientError: If the request fails or retries are exhausted
+        """
+        session = self._get_async_session()
+        limiter = self._get_limiter(
+            'musicbrainz' if url.startswith(self.musicbrainz_search_url) else 'acousticbrainz'
+        )
+        delay = RATE_LIMIT_BACKOFF
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                async with limiter, session.get(url, params=params) as response:
+                    if response.status == 429:
+                        response.raise_for_status()
+                    if response.status != 200:
+                        return response.status, None
+                    return response.status, await read(response)
+            except aiohttp.ClientResponseError as e:
+                if e.status != 429 or attempt == RATE_LIMIT_RETRIES:
+                    raise
+                logger.warning("Rate limited by %s, retrying in %.1fs", url, delay)
+                await asyncio.sleep(delay)
+                delay *= 2
+        raise aiohttp.ClientError(f"Rate limit retries exhausted for {url}")
+    
+    async def _aget_json(self, url: str, params: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        """GET a JSON resource, returning (HTTP status, parsed JSON or None)"""
+        async def read_json(response: aiohttp.ClientResponse) -> Any:
+            return loads(await response.read())
+        
+        return await self._aget(url, params, read_json)
+    
+    async def _afetch_highlevel(self, mbid: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Async variant of _fetch_highlevel"""
+        result = self._highlevel_docs.get(mbid)
+        if result is None:
+            result = await self._adownload_highlevel(mbid)
+            if _is_definitive(result):
+                self._highlevel_docs[mbid] = result
+        return result
+    
+    @cached('highlevel', ttl=CACHE_TTL, cache_if=_is_definitive)
+    async def _adownload_highlevel(self, mbid: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Async variant of _download_highlevel"""
+        return await self._aget_json(f"{self.base_url}/{mbid}/high-level")
+    
+    async def _afetch_lowlevel_bpm(self, mbid: str) -> Tuple[int, Optional[float]]:
+        """Async variant of _fetch_lowlevel_bpm"""
+        result = self._lowlevel_bpms.get(mbid)
+        if result is None:
+            result = await self._aget(f"{self.base_url}/{mbid}/low-level", None, self._aread_lowlevel_bpm)
+            if _is_definitive(result):
+                self._lowlevel_bpms[mbid] = result
+        return result
+    
+    async def _aread_lowlevel_bpm(self, response: aiohttp.ClientResponse) -> Optional[float]:
+        """Async variant of _read_lowlevel_bpm"""
+        if ijson is None:
+            return self._extract_bpm_from_lowlevel(loads(await response.read()))
+        return await _ascan_lowlevel_events(ijson.parse_async(response.content, use_float=True))
+    
+    @cached('bpm', ttl=CACHE_TTL, negative=(DataNotFoundError,))
+    async def aget_track_bpm_by_mbid(self, mbid: str) -> Optional[float]:
+        """
+        Async variant of get_track_bpm_by_mbid
+        
+        Args:
+            mbid: MusicBrainz ID for the track
             
-            return None
+        Returns:
+            BPM value if found, None otherwise
             
+        Raises:
+            ExternalAPIError: If API request fails
+            DataNotFoundError: If track not found
+        """
+        try:
+            bpm = self._bpm_from_highlevel(mbid, await self._afetch_highlevel(mbid))
+            if bpm:
+                return bpm
+            return self._bpm_from_lowlevel(mbid, await self._afetch_lowlevel_bpm(mbid))
+            
+        except (DataNotFoundError, ExternalAPIError):
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Network error accessing AcousticBrainz: %s", e)
+            raise ExternalAPIError(f"Failed to connect to AcousticBrainz: {str(e)}")
         except Exception as e:
-            logger.error(f"Error extracting BPM from high-level data: {e}")
+            logger.error("Unexpected error getting BPM from AcousticBrainz: %s", e)
+            raise BPMAnalysisError(f"Failed to analyze BPM via AcousticBrainz: {str(e)}")
+    
+    async def asearch_mbid_by_track(self, artist: str, track_name: str) -> Optional[str]:
+        """Async variant of search_mbid_by_track"""
+        try:
+            return await self._asearch_mbid(artist, track_name)
+        except Exception as e:
+            logger.error("Error searching MBID: %s", e)
+            return None
+    
+    @cached('mbid', ttl=CACHE_TTL)
+    async def _asearch_mbid(self, artist: str, track_name: str) -> Optional[str]:
+        """Async variant of _search_mbid"""
+        known = self._batch_mbids.get(_pair_key(artist, track_name))
+        if known:
+            return known
+        
+        params = self._mbid_search_params(artist, track_name)
+        status, data = await self._aget_json(self.musicbrainz_search_url, params=params)
+        if status != 200:
+            raise ExternalAPIError(f"MusicBrainz API error: {status}")
+        return self._mbid_from_search(data, artist, track_name)
+    
+    async def aget_track_bpm(self, artist: str, track_name: str) -> Optional[float]:
+        """
+        Async variant of get_track_bpm, using the shared aiohttp session
+        
+        Args:
+            artist: Artist name
+            track_name: Track name
+            
+        Returns:
+            BPM value if found, None otherwise
+        """
+        mbid = await self.asearch_mbid_by_track(artist, track_name)
+        if not mbid:
             return None
+        
+        return await self.aget_track_bpm_by_mbid(mbid)
+    
+    def _extract_bpm_from_highlevel(self, data: Dict[str, Any]) -> Optional[float]:
+        """Extract BPM from high-level AcousticBrainz data"""
+        # High-level data contains rhythm descriptors
+        for path in _HIGHLEVEL_PATHS:
+            value: Any = data
+            for part in path:
+                value = value.get(part) if type(value) is dict else None
+            if (bpm := _valid_bpm(value)) is not None:
+                return bpm
+        
+        return None
     
     def _extract_bpm_from_lowlevel(self, data: Dict[str, Any]) -> Optional[float]:
         """Extract BPM from low-level AcousticBrainz data"""
@@ -183,17 +514,16 @@ class AcousticBrainzAnalyzer:
                 tempo = rhythm['tempo']
                 if isinstance(tempo, dict):
                     # Multiple tempo estimates
-                    for key, value in tempo.items():
-                        if isinstance(value, (int, float)) and 60 <= value <= 200:
-                            bpm_candidates.append(float(value))
-                elif isinstance(tempo, (int, float)) and 60 <= tempo <= 200:
-                    bpm_candidates.append(float(tempo))
+                    for value in tempo.values():
+                        if (bpm := _valid_bpm(value)) is not None:
+                            bpm_candidates.append(bpm)
+                elif (bpm := _valid_bpm(tempo)) is not None:
+                    bpm_candidates.append(bpm)
             
             # Check for BPM field
             if 'bpm' in rhythm:
-                bpm = rhythm['bpm']
-                if isinstance(bpm, (int, float)) and 60 <= bpm <= 200:
-                    bpm_candidates.append(float(bpm))
+                if (bpm := _valid_bpm(rhythm['bpm'])) is not None:
+                    bpm_candidates.append(bpm)
             
             # Return the first valid BPM found
             if bpm_candidates:
@@ -202,7 +532,7 @@ class AcousticBrainzAnalyzer:
             return None
             
         except Exception as e:
-            logger.error(f"Error extracting BPM from low-level data: {e}")
+            logger.error("Error extracting BPM from low-level data: %s", e)
             return None
     
     def get_track_info(self, artist: str, track_name: str) -> Dict[str, Any]:
@@ -237,11 +567,11 @@ class AcousticBrainzAnalyzer:
             }
             
             # Try to get high-level data
+            has_highlevel = False
             try:
-                url = f"{self.base_url}/{mbid}/high-level"
-                response = self.session.get(url, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
+                _, data = self._fetch_highlevel(mbid)
+                if data is not None:
+                    has_highlevel = True
                     info['bpm'] = self._extract_bpm_from_highlevel(data)
                     
                     # Extract additional features
@@ -252,33 +582,78 @@ class AcousticBrainzAnalyzer:
             except Exception:
                 pass
             
-            # Try to get low-level data if high-level failed
-            if not info['bpm']:
+            # Tracks without high-level data almost never have low-level data,
+            # so only fall back when high-level came back without a BPM
+            if info['bpm'] is None and has_highlevel:
                 try:
-                    url = f"{self.base_url}/{mbid}/low-level"
-                    response = self.session.get(url, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-                        info['bpm'] = self._extract_bpm_from_lowlevel(data)
+                    info['bpm'] = self._fetch_lowlevel_bpm(mbid)[1]
                 except Exception:
                     pass
             
             return info
             
         except Exception as e:
-            logger.warning(f"Could not get track info from AcousticBrainz: {e}")
+            logger.warning("Could not get track info from AcousticBrainz: %s", e)
             return {
                 'artist': artist,
                 'track': track_name,
                 'error': str(e)
             }
     
+    def _fetch_highlevel(self, mbid: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Get the high-level document for an MBID as (HTTP status, JSON or None), at most once"""
+        result = self._highlevel_docs.get(mbid)
+        if result is None:
+            result = self._download_highlevel(mbid)
+            if _is_definitive(result):
+                self._highlevel_docs[mbid] = result
+        return result
+    
+    @cached('highlevel', ttl=CACHE_TTL, cache_if=_is_definitive)
+    def _download_highlevel(self, mbid: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Request the high-level document for an MBID"""
+        response = self.session.get(f"{self.base_url}/{mbid}/high-level", timeout=10)
+        if response.status_code != 200:
+            return response.status_code, None
+        return 200, loads(response.content)
+    
+    def _fetch_lowlevel_bpm(self, mbid: str) -> Tuple[int, Optional[float]]:
+        """Get the low-level BPM for an MBID as (HTTP status, BPM or None), at most once"""
+        result = self._lowlevel_bpms.get(mbid)
+        if result is None:
+            url = f"{self.base_url}/{mbid}/low-level"
+            with self.session.get(url, timeout=10, stream=True) as response:
+                if response.status_code != 200:
+                    result = response.status_code, None
+                else:
+                    result = 200, self._read_lowlevel_bpm(response)
+            if _is_definitive(result):
+                self._lowlevel_bpms[mbid] = result
+        return result
+    
+    def _read_lowlevel_bpm(self, response: requests.Response) -> Optional[float]:
+        """
+        Read the BPM from a low-level response
+        
+        Low-level documents run to hundreds of KB, so with ijson installed the
+        body is streamed and parsing stops at the first rhythm BPM value.
+        """
+        if ijson is None:
+            return self._extract_bpm_from_lowlevel(loads(response.content))
+        response.raw.decode_content = True
+        return _scan_lowlevel_events(ijson.parse(response.raw, use_float=True))
+    
     def is_available(self) -> bool:
-        """Check if AcousticBrainz API is available and accessible"""
+        """Check if AcousticBrainz API is available, reusing the last result for AVAILABILITY_TTL seconds"""
+        return self._availability()
+    
+    def _probe_availability(self) -> bool:
+        """Request a well-known document to see whether AcousticBrainz responds"""
         try:
             # Test with a well-known track MBID
             test_url = f"{self.base_url}/5b11f4ce-a62d-471e-81fc-a69a8278c7da/high-level"
-            response = self.session.get(test_url, timeout=5)
+            # Bypass the session's retrying adapter so a hung host costs one timeout
+            response = requests.get(test_url, headers=self.session.headers, timeout=5)
             return response.status_code in [200, 404]  # 404 is ok, means service is up
         except Exception:
             return False
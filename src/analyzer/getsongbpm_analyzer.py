@@ -1,21 +1,114 @@
 """
 GetSongBPM.com API integration for BPM analysis
 """
+import asyncio
+import re
+import aiohttp
 import requests
 import logging
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, NoReturn, TypedDict
 from src.exceptions.analysis_exceptions import ExternalAPIError, BPMAnalysisError
+from ._availability import AvailabilityCheck
+from ._http import AsyncHTTPClient
+from ._cache import Cache, cached
+from ._json import loads
+
+try:
+    from rapidfuzz.distance import Indel
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
 
 logger = logging.getLogger(__name__)
 
-class GetSongBPMAnalyzer:
-    def __init__(self, api_key: Optional[str] = None) -> None:
+# Common suffixes that interfere with search, stripped when they follow " - " or are
+# bracketed, optionally with a year (e.g. "- 2011 Remaster", "(Live)")
+SEARCH_SUFFIXES = (
+    "Remastered", "Remaster", "Remix", "Radio Edit",
+    "Extended", "Original Mix", "Radio Version", "Album Version",
+    "Single Version", "Bonus Track", "Deluxe", "Edit", "Live"
+)
+_VERSION_PATTERN = (
+    r'(?:\d{4}\s+)?(?:' + '|'.join(map(re.escape, SEARCH_SUFFIXES)) + r')(?:\s+\d{4})?'
+)
+# Bracketed featured artists, e.g. "(feat. X)" or "[ft. X & Y]"
+_FEATURING_PATTERN = r'(?:feat\.?|ft\.?|featuring)\s[^)\]]*'
+# All trailing suffixes are removed in one end-anchored pass
+_SUFFIX_RE = re.compile(
+    r'(?:\s*-\s+' + _VERSION_PATTERN +
+    r'|\s*[(\[](?:' + _VERSION_PATTERN + '|' + _FEATURING_PATTERN + r')[)\]])+\s*$',
+    re.IGNORECASE
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Lookups (including misses) are cached for 30 days, published tempos rarely change
+CACHE_TTL = 30 * 86400
+
+# Minimum similarity score for a fuzzy artist/title match
+SIMILARITY_THRESHOLD = 0.7
+
+# How far Sift3 looks ahead when characters stop lining up
+SIFT3_MAX_OFFSET = 5
+
+# Targets shorter than this only match by substring, fuzzy scores are noise there
+MIN_FUZZY_LENGTH = 3
+
+class BPMMatch(TypedDict):
+    """A search result's BPM, with whether it passed the artist/title match check"""
+    bpm: float
+    matched: bool
+
+def _sift3_common(str1: str, str2: str, max_offset: int = SIFT3_MAX_OFFSET) -> int:
+    """Approximate longest common subsequence length of two strings (Sift3)"""
+    common = offset1 = offset2 = c = 0
+    while c + offset1 < len(str1) and c + offset2 < len(str2):
+        if str1[c + offset1] == str2[c + offset2]:
+            common += 1
+        else:
+            # Look a few characters ahead in either string to resynchronize
+            offset1 = offset2 = 0
+            for i in range(max_offset):
+                if c + i < len(str1) and str1[c + i] == str2[c]:
+                    offset1 = i
+                    break
+                if c + i < len(str2) and str1[c] == str2[c + i]:
+                    offset2 = i
+                    break
+        c += 1
+    return common
+
+class GetSongBPMAnalyzer(AsyncHTTPClient):
+    # Searches are spaced to at most 2.5 per second
+    RATE_LIMITS = {'getsongbpm': (2.5, 1.0)}
+    
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[Cache] = None) -> None:
+        self.cache = cache
         self.base_url = "https://api.getsong.co"  # Correct base URL
         self.api_key = api_key or "demo"  # fallback to demo key
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'TempoCraft/1.0 (Spotify Playlist Creator)'
         })
+        
+        # Keep connections alive across bursts of lookups and retry transient failures;
+        # the final response is still returned so status handling below applies
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        super().__init__({'User-Agent': str(self.session.headers['User-Agent'])})
+        
+        self._availability = AvailabilityCheck(self._probe_availability)
     
     def get_track_bpm(self, artist: str, track_name: str) -> Optional[float]:
         """
@@ -32,153 +125,238 @@ class GetSongBPMAnalyzer:
             ExternalAPIError: If API request fails
             BPMAnalysisError: If BPM analysis fails
         """
-        try:
-            # Clean up track name and artist for better search results
-            clean_artist = self._clean_search_term(artist)
-            clean_track = self._clean_search_term(track_name)
+        match = self.search_track_bpm(artist, track_name)
+        return match['bpm'] if match else None
+    
+    async def aget_track_bpm(self, artist: str, track_name: str) -> Optional[float]:
+        """Async variant of get_track_bpm"""
+        match = await self.asearch_track_bpm(artist, track_name)
+        return match['bpm'] if match else None
+    
+    def search_track_bpm(self, artist: str, track_name: str) -> Optional[BPMMatch]:
+        """
+        Search GetSongBPM.com for a track's BPM, telling verified matches from guesses
+        
+        Args:
+            artist: Artist name
+            track_name: Track name
             
-            # Search for the track - using correct format for "both" type
-            search_url = f"{self.base_url}/search/"
-            params = {
-                'api_key': self.api_key,
-                'type': 'both',
-                'lookup': f"song:{clean_track} artist:{clean_artist}"  # Correct format
-            }
+        Returns:
+            The BPM with matched=False when it was taken from the first search
+            result without passing the match check, or None if not found
             
+        Raises:
+            ExternalAPIError: If API request fails
+            BPMAnalysisError: If BPM analysis fails
+        """
+        # Clean up track name and artist for better search results; versions of a
+        # track that clean to the same terms share one request and cache entry
+        return self._search(self._clean_search_term(artist), self._clean_search_term(track_name))
+    
+    @cached('getsongbpm-match', ttl=CACHE_TTL)
+    def _search(self, clean_artist: str, clean_track: str) -> Optional[BPMMatch]:
+        """Search for already cleaned terms, raising on request failures so they aren't cached"""
+        try:
             logger.info(f"Searching GetSongBPM for: {clean_artist} - {clean_track}")
-            response = self.session.get(search_url, params=params, timeout=10)
+            response = self.session.get(
+                f"{self.base_url}/search/",
+                params=self._search_params(clean_artist, clean_track),
+                timeout=10
+            )
             
             if response.status_code == 200:
-                data = response.json()
-                logger.debug(f"GetSongBPM response data: {data}")
-                
-                if 'search' in data:
-                    search_result = data['search']
-                    
-                    # Check if it's an error response
-                    if isinstance(search_result, dict) and 'error' in search_result:
-                        logger.warning(f"No BPM found for {track_name} via GetSongBPM: {search_result['error']}")
-                        return None
-                    
-                    # Check if it's a list with results
-                    if isinstance(search_result, list) and search_result:
-                        # Look for exact or close matches
-                        for result in search_result:
-                            logger.debug(f"Checking result: {result}")
-                            if self._is_good_match(result, clean_artist, clean_track):
-                                bpm = float(result.get('tempo', 0))
-                                if bpm > 0:
-                                    logger.info(f"Found BPM {bpm} for {track_name} via GetSongBPM")
-                                    return bpm
-                        
-                        # If no exact match, try the first result
-                        first_result = search_result[0]
-                        logger.debug(f"Using first result: {first_result}")
-                        bpm = float(first_result.get('tempo', 0))
-                        if bpm > 0:
-                            logger.info(f"Found BPM {bpm} for {track_name} via GetSongBPM (first match)")
-                            return bpm
-                
-                logger.warning(f"No BPM found for {track_name} via GetSongBPM")
-                return None
-                
-            elif response.status_code == 429:
-                logger.warning("GetSongBPM rate limit exceeded")
-                raise ExternalAPIError("GetSongBPM rate limit exceeded")
-            elif response.status_code == 401:
-                logger.error("GetSongBPM API key invalid")
-                raise ExternalAPIError("GetSongBPM API key invalid")
-            else:
-                logger.error(f"GetSongBPM API error: {response.status_code}")
-                raise ExternalAPIError(f"GetSongBPM API returned status {response.status_code}")
+                return self._bpm_from_search(loads(response.content), clean_artist, clean_track)
+            self._raise_for_status(response.status_code)
                 
+        except ExternalAPIError:
+            raise
         except requests.exceptions.Timeout:
-            logger.error(f"GetSongBPM timeout for {track_name}")
-            raise ExternalAPIError(f"GetSongBPM timeout for {track_name}")
+            logger.error(f"GetSongBPM timeout for {clean_track}")
+            raise ExternalAPIError(f"GetSongBPM timeout for {clean_track}")
         except requests.exceptions.RequestException as e:
-            logger.error(f"GetSongBPM network error for {track_name}: {e}")
+            logger.error(f"GetSongBPM network error for {clean_track}: {e}")
+            raise ExternalAPIError(f"GetSongBPM network error: {e}")
+        except (ValueError, KeyError) as e:
+            logger.error(f"GetSongBPM data parsing error for {clean_track}: {e}")
+            raise BPMAnalysisError(f"Failed to parse GetSongBPM data: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected GetSongBPM error for {clean_track}: {e}")
+            raise BPMAnalysisError(f"Unexpected GetSongBPM error: {e}")
+    
+    async def asearch_track_bpm(self, artist: str, track_name: str) -> Optional[BPMMatch]:
+        """
+        Async variant of search_track_bpm, sharing one aiohttp session across calls
+        
+        Args:
+            artist: Artist name
+            track_name: Track name
+            
+        Returns:
+            The BPM with matched=False when it was taken from the first search
+            result without passing the match check, or None if not found
+            
+        Raises:
+            ExternalAPIError: If API request fails
+            BPMAnalysisError: If BPM analysis fails
+        """
+        return await self._asearch(self._clean_search_term(artist), self._clean_search_term(track_name))
+    
+    @cached('getsongbpm-match', ttl=CACHE_TTL)
+    async def _asearch(self, clean_artist: str, clean_track: str) -> Optional[BPMMatch]:
+        """Async variant of _search"""
+        try:
+            logger.info(f"Searching GetSongBPM for: {clean_artist} - {clean_track}")
+            session = self._get_async_session()
+            async with self._get_limiter('getsongbpm'), session.get(
+                f"{self.base_url}/search/",
+                params=self._search_params(clean_artist, clean_track)
+            ) as response:
+                if response.status == 200:
+                    data = loads(await response.read())
+                    return self._bpm_from_search(data, clean_artist, clean_track)
+                self._raise_for_status(response.status)
+                
+        except ExternalAPIError:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"GetSongBPM timeout for {clean_track}")
+            raise ExternalAPIError(f"GetSongBPM timeout for {clean_track}")
+        except aiohttp.ClientError as e:
+            logger.error(f"GetSongBPM network error for {clean_track}: {e}")
             raise ExternalAPIError(f"GetSongBPM network error: {e}")
         except (ValueError, KeyError) as e:
-            logger.error(f"GetSongBPM data parsing error for {track_name}: {e}")
+            logger.error(f"GetSongBPM data parsing error for {clean_track}: {e}")
             raise BPMAnalysisError(f"Failed to parse GetSongBPM data: {e}")
         except Exception as e:
-            logger.error(f"Unexpected GetSongBPM error for {track_name}: {e}")
+            logger.error(f"Unexpected GetSongBPM error for {clean_track}: {e}")
             raise BPMAnalysisError(f"Unexpected GetSongBPM error: {e}")
     
+    def _search_params(self, clean_artist: str, clean_track: str) -> Dict[str, str]:
+        """Query parameters for a "both" type search"""
+        return {
+            'api_key': self.api_key,
+            'type': 'both',
+            'lookup': f"song:{clean_track} artist:{clean_artist}"  # Correct format
+        }
+    
+    def _raise_for_status(self, status: int) -> NoReturn:
+        """Raise the ExternalAPIError matching a non-200 search response"""
+        if status == 429:
+            logger.warning("GetSongBPM rate limit exceeded")
+            raise ExternalAPIError("GetSongBPM rate limit exceeded")
+        elif status == 401:
+            logger.error("GetSongBPM API key invalid")
+            raise ExternalAPIError("GetSongBPM API key invalid")
+        logger.error(f"GetSongBPM API error: {status}")
+        raise ExternalAPIError(f"GetSongBPM API returned status {status}")
+    
+    def _bpm_from_search(self, data: Dict[str, Any], clean_artist: str,
+                         clean_track: str) -> Optional[BPMMatch]:
+        """Pick the BPM of the best matching result from a search response"""
+        logger.debug(f"GetSongBPM response data: {data}")
+        
+        if 'search' in data:
+            search_result = data['search']
+            
+            # Check if it's an error response
+            if isinstance(search_result, dict) and 'error' in search_result:
+                logger.warning(f"No BPM found for {clean_track} via GetSongBPM: {search_result['error']}")
+                return None
+            
+            # Check if it's a list with results
+            if isinstance(search_result, list) and search_result:
+                # Normalize the targets once for the whole result list
+                target_artist = clean_artist.casefold()
+                target_track = clean_track.casefold()
+                
+                # Look for exact or close matches
+                for result in search_result:
+                    logger.debug(f"Checking result: {result}")
+                    if self._is_good_match(result, target_artist, target_track):
+                        bpm = float(result.get('tempo', 0))
+                        if bpm > 0:
+                            logger.info(f"Found BPM {bpm} for {clean_track} via GetSongBPM")
+                            return {'bpm': bpm, 'matched': True}
+                
+                # If no exact match, try the first result
+                first_result = search_result[0]
+                logger.debug(f"Using first result: {first_result}")
+                bpm = float(first_result.get('tempo', 0))
+                if bpm > 0:
+                    logger.info(f"Found BPM {bpm} for {clean_track} via GetSongBPM (first match)")
+                    return {'bpm': bpm, 'matched': False}
+        
+        logger.warning(f"No BPM found for {clean_track} via GetSongBPM")
+        return None
+    
     def _clean_search_term(self, term: str) -> str:
         """Clean search terms for better matching"""
         if not term:
             return ""
         
-        # Remove common suffixes that might interfere with search
-        suffixes_to_remove = [
-            "- Remastered", "- Remaster", "- Remix", "- Radio Edit", 
-            "- Extended", "- Original Mix", "- Radio Version", "- Album Version",
-            "- Single Version", "- Bonus Track", "- Deluxe", "- Edit"
-        ]
-        
-        cleaned = term.strip()
-        for suffix in suffixes_to_remove:
-            if cleaned.endswith(suffix):
-                cleaned = cleaned[:-len(suffix)].strip()
+        # Remove common suffixes that might interfere with search, in one pass
+        cleaned = _SUFFIX_RE.sub('', term.strip())
         
-        # Remove extra whitespace and special characters that might cause issues
-        cleaned = ' '.join(cleaned.split())
-        
-        return cleaned
+        # Collapse extra whitespace that might cause issues
+        return _WHITESPACE_RE.sub(' ', cleaned).strip()
     
     def _is_good_match(self, result: Dict[str, Any], target_artist: str, target_track: str) -> bool:
-        """Check if the search result is a good match for the target"""
-        # Correct field names based on actual GetSongBPM API response
-        result_artist = result.get('artist', {}).get('name', '').lower()
-        result_song = result.get('title', '').lower()  # Direct title field
+        """Check if the search result is a good match for the (already casefolded) target"""
+        # Correct field names based on actual GetSongBPM API response; fields may be null
+        result_artist = ((result.get('artist') or {}).get('name') or '').casefold()
+        result_song = (result.get('title') or '').casefold()  # Direct title field
         
-        target_artist_lower = target_artist.lower()
-        target_track_lower = target_track.lower()
+        # An empty field would otherwise be a substring of any target
+        if not result_artist or not result_song:
+            return False
         
-        # Check for artist match (partial match is OK)
+        # Check for artist match (partial match is OK), fuzzy only when substrings fail
         artist_match = (
-            target_artist_lower in result_artist or 
-            result_artist in target_artist_lower or
-            self._similarity_score(target_artist_lower, result_artist) > 0.7
+            target_artist in result_artist or 
+            result_artist in target_artist or
+            (len(target_artist) >= MIN_FUZZY_LENGTH and
+             self._similarity_score(target_artist, result_artist) > SIMILARITY_THRESHOLD)
         )
+        if not artist_match:
+            return False
         
-        # Check for track match (partial match is OK)
-        track_match = (
-            target_track_lower in result_song or 
-            result_song in target_track_lower or
-            self._similarity_score(target_track_lower, result_song) > 0.7
+        # Check for track match (partial match is OK), fuzzy only when substrings fail
+        return (
+            target_track in result_song or 
+            result_song in target_track or
+            (len(target_track) >= MIN_FUZZY_LENGTH and
+             self._similarity_score(target_track, result_song) > SIMILARITY_THRESHOLD)
         )
-        
-        return artist_match and track_match
     
     def _similarity_score(self, str1: str, str2: str) -> float:
-        """Simple similarity score between two strings"""
-        if not str1 or not str2:
+        """Similarity score between two casefolded strings, from 0.0 to 1.0"""
+        len1, len2 = len(str1), len(str2)
+        if len1 == 0 or len2 == 0:
             return 0.0
         
-        # Simple character-based similarity
-        set1 = set(str1.lower().replace(' ', ''))
-        set2 = set(str2.lower().replace(' ', ''))
-        
-        if not set1 or not set2:
+        # Both scores are at most 2 * shorter / (len1 + len2); skip pairs
+        # whose lengths alone keep them from reaching the threshold
+        if 2 * min(len1, len2) <= SIMILARITY_THRESHOLD * (len1 + len2):
             return 0.0
         
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
+        if HAS_RAPIDFUZZ:
+            # Bit-parallel LCS-based similarity, in C
+            return Indel.normalized_similarity(str1, str2)
         
-        return intersection / union if union > 0 else 0.0
+        # Sift3 approximates the LCS, scored the same way as Indel similarity
+        return 2 * _sift3_common(str1, str2) / (len1 + len2)
     
     def is_available(self) -> bool:
-        """Check if GetSongBPM API is available"""
+        """Check if GetSongBPM API is available, reusing the last result for AVAILABILITY_TTL seconds"""
+        return self._availability()
+    
+    def _probe_availability(self) -> bool:
+        """Send a HEAD request to see whether GetSongBPM responds, without running a search"""
         try:
-            test_url = f"{self.base_url}/search/"
-            params = {
-                'api_key': self.api_key,
-                'type': 'song',
-                'lookup': 'test'
-            }
-            response = self.session.get(test_url, params=params, timeout=5)
-            return response.status_code in [200, 404]  # 404 is OK, means API is up but no results
+            # Plain requests.head: a retried HEAD would multiply the wait on a dead host
+            response = requests.head(
+                f"{self.base_url}/", headers=self.session.headers, timeout=3, allow_redirects=False
+            )
+            return response.status_code < 500  # Any client-side status means the API is up
         except Exception:
             return False
@@ -1,26 +1,102 @@
 """
 Music analysis utilities
 """
+import asyncio
+import functools
+import inspect
 import spotipy
 import logging
-from typing import List, Optional, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Coroutine, List, Optional, Dict, Tuple
 from src.models.track import Track
 from src.exceptions.spotify_exceptions import SpotifyQuotaExceededError
 from src.exceptions.analysis_exceptions import (
     BPMAnalysisError, 
     GenreAnalysisError, 
-    ExternalAPIError
+    ExternalAPIError,
+    DataNotFoundError
 )
+from ._cache import Cache, cached
 from .acousticbrainz_analyzer import AcousticBrainzAnalyzer
-from .getsongbpm_analyzer import GetSongBPMAnalyzer
+from .getsongbpm_analyzer import BPMMatch, GetSongBPMAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on tracks analyzed concurrently, keeps external API load polite
+MAX_CONCURRENT_TRACKS = 10
+
+# Spotify's audio features endpoint accepts at most this many IDs per request
+AUDIO_FEATURES_BATCH_SIZE = 100
+
+# Artist genre lookups are cached for a week, Spotify updates them occasionally
+GENRE_CACHE_TTL = 7 * 86400
+
+# A fallback source's BPM and whether it is trusted to win the race outright
+BPMResult = Tuple[float, bool]
+
+# A fallback source's name with its sync and async BPM lookups
+BPMLookups = Tuple[str, Callable[[Track], Optional[BPMResult]],
+                   Callable[[Track], Coroutine[Any, Any, Optional[BPMResult]]]]
+
+def _log_lookup_error(source_name: str, track: Track, error: Exception) -> None:
+    """Log a failed fallback lookup, which the race treats like a miss"""
+    if isinstance(error, (ExternalAPIError, BPMAnalysisError, DataNotFoundError)):
+        logger.error(f"{source_name} BPM lookup failed for {track.name}: {error}")
+    else:
+        logger.error(f"Unexpected error in {source_name} BPM lookup for {track.name}: {error}")
+
+def _fallback_lookup(source_name: str) -> Callable:
+    """Decorator making a sync or async fallback lookup return None instead of raising"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self: Any, track: Track) -> Optional[BPMResult]:
+                try:
+                    return await func(self, track)
+                except Exception as e:
+                    _log_lookup_error(source_name, track, e)
+                    return None
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self: Any, track: Track) -> Optional[BPMResult]:
+            try:
+                return func(self, track)
+            except Exception as e:
+                _log_lookup_error(source_name, track, e)
+                return None
+        return wrapper
+    return decorator
+
+class _BPMRace:
+    """Result selection shared by the sync and async fallback races"""
+    
+    def __init__(self) -> None:
+        # (bpm, source) of the confident winner, else of the first unverified guess
+        self.best: Optional[Tuple[float, str]] = None
+    
+    def offer(self, source: str, result: Optional[BPMResult]) -> bool:
+        """Record a source's result, True once it is confident enough to end the race"""
+        if not result:
+            return False
+        bpm, confident = result
+        if confident:
+            self.best = (bpm, source)
+            return True
+        # An unverified guess only counts once every other source came up empty
+        self.best = self.best or (bpm, source)
+        return False
+
 class MusicAnalyzer:
     def __init__(self, spotify_client: spotipy.Spotify, 
                  acousticbrainz_analyzer: Optional[AcousticBrainzAnalyzer] = None,
-                 getsongbpm_analyzer: Optional[GetSongBPMAnalyzer] = None):
+                 getsongbpm_analyzer: Optional[GetSongBPMAnalyzer] = None,
+                 cache: Optional[Cache] = None,
+                 use_spotify_features: bool = False):
         self.sp = spotify_client
+        self.cache = cache
+        # Spotify audio features are off by default, the endpoint is restricted for new apps
+        self.use_spotify_features = use_spotify_features
         self.acousticbrainz = acousticbrainz_analyzer
         self.getsongbpm = getsongbpm_analyzer
         self.fallback_enabled = acousticbrainz_analyzer is not None or getsongbpm_analyzer is not None
@@ -43,86 +119,153 @@ class MusicAnalyzer:
             raise BPMAnalysisError(f"Unexpected error getting BPM for {track.name}: {e}")
         return False
     
+    def get_audio_features_batch(self, tracks: List[Track]) -> None:
+        """Get BPM (tempo) for many tracks using Spotify API, 100 tracks per request"""
+        for start in range(0, len(tracks), AUDIO_FEATURES_BATCH_SIZE):
+            batch = tracks[start:start + AUDIO_FEATURES_BATCH_SIZE]
+            try:
+                features = self.sp.audio_features([track.id for track in batch])
+            except spotipy.exceptions.SpotifyException as e:
+                if e.http_status == 403:
+                    raise SpotifyQuotaExceededError(f"Quota exceeded for {len(batch)} tracks")
+                else:
+                    raise BPMAnalysisError(f"Failed to get BPM for {len(batch)} tracks: {e}")
+            except Exception as e:
+                raise BPMAnalysisError(f"Unexpected error getting BPM for {len(batch)} tracks: {e}")
+            
+            # Results come back in request order, None for unknown IDs
+            for track, feature in zip(batch, features or []):
+                if feature and feature.get('tempo'):
+                    track.bpm = feature['tempo']
+                    track.bpm_source = "spotify"
+                    logger.info(f"Got BPM {track.bpm} for {track.name} via Spotify")
+    
     def get_bpm_with_fallback(self, track: Track) -> bool:
-        """Get BPM using multiple fallback sources (Spotify disabled for testing)"""
+        """Get BPM from the fallback sources, blocking; public API, analyze_tracks uses the async variant"""
+        if track.bpm is not None:
+            return True
+        
         logger.info(f"Skipping Spotify BPM (disabled), trying fallback sources for {track.name}")
         
-        # Try AcousticBrainz first
-        if self.acousticbrainz and self._get_bpm_from_acousticbrainz(track):
-            return True
+        # Query the fallback sources in parallel and keep the first confident BPM found
+        lookups = self._bpm_lookups()
+        race = _BPMRace()
+        if lookups:
+            executor = ThreadPoolExecutor(max_workers=len(lookups))
+            try:
+                futures = {executor.submit(lookup, track): source for source, lookup, _ in lookups}
+                for future in as_completed(futures):
+                    if race.offer(futures[future], future.result()):
+                        break
+            finally:
+                # Don't wait on a slower source once a BPM is found
+                executor.shutdown(wait=False)
         
-        # Try GetSongBPM as second fallback
-        if self.getsongbpm and self._get_bpm_from_getsongbpm(track):
+        return self._finish_race(track, race)
+    
+    def _bpm_lookups(self) -> List[BPMLookups]:
+        """Configured fallback sources with their sync and async BPM lookups"""
+        lookups: List[BPMLookups] = []
+        if self.acousticbrainz:
+            lookups.append(("acousticbrainz", self._lookup_acousticbrainz_bpm,
+                            self._alookup_acousticbrainz_bpm))
+        if self.getsongbpm:
+            lookups.append(("getsongbpm", self._lookup_getsongbpm_bpm,
+                            self._alookup_getsongbpm_bpm))
+        return lookups
+    
+    def _finish_race(self, track: Track, race: _BPMRace) -> bool:
+        """Record the race's best BPM on the track, False if no source found one"""
+        if race.best:
+            self._set_bpm(track, *race.best)
             return True
         
         logger.error("No BPM found from any fallback source")
         return False
     
-    def _get_bpm_from_acousticbrainz(self, track: Track) -> bool:
+    def _set_bpm(self, track: Track, bpm: float, source: str) -> None:
+        """Record a BPM found by a fallback source on the track"""
+        track.bpm = bpm
+        track.bpm_source = source
+        logger.info(f"Got BPM {track.bpm} for {track.name} via {source}")
+    
+    @_fallback_lookup("AcousticBrainz")
+    def _lookup_acousticbrainz_bpm(self, track: Track) -> Optional[BPMResult]:
         """Get BPM using AcousticBrainz API"""
-        try:
-            if not self.acousticbrainz:
-                return False
-            
-            bpm = self.acousticbrainz.get_track_bpm(track.artist, track.name)
-            if bpm:
-                track.bpm = bpm
-                track.bpm_source = "acousticbrainz"
-                logger.info(f"Got BPM {track.bpm} for {track.name} via AcousticBrainz")
-                return True
-            else:
-                logger.warning(f"No BPM found for {track.name} via AcousticBrainz")
-                return False
-        except (ExternalAPIError, BPMAnalysisError) as e:
-            logger.error(f"AcousticBrainz BPM lookup failed for {track.name}: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Unexpected error in AcousticBrainz BPM lookup for {track.name}: {e}")
-            return False
-
-    def _get_bpm_from_getsongbpm(self, track: Track) -> bool:
+        if not self.acousticbrainz:
+            return None
+        bpm = self.acousticbrainz.get_track_bpm(track.artist, track.name)
+        return self._acousticbrainz_result(track, bpm)
+    
+    @_fallback_lookup("AcousticBrainz")
+    async def _alookup_acousticbrainz_bpm(self, track: Track) -> Optional[BPMResult]:
+        """Get BPM using AcousticBrainz API without blocking the event loop"""
+        if not self.acousticbrainz:
+            return None
+        bpm = await self.acousticbrainz.aget_track_bpm(track.artist, track.name)
+        return self._acousticbrainz_result(track, bpm)
+    
+    def _acousticbrainz_result(self, track: Track, bpm: Optional[float]) -> Optional[BPMResult]:
+        """Race result of an AcousticBrainz lookup"""
+        if not bpm:
+            logger.warning(f"No BPM found for {track.name} via AcousticBrainz")
+            return None
+        # Looked up by MusicBrainz recording ID, so the track itself was identified
+        return bpm, True
+    
+    @_fallback_lookup("GetSongBPM")
+    def _lookup_getsongbpm_bpm(self, track: Track) -> Optional[BPMResult]:
         """Get BPM using GetSongBPM API"""
-        try:
-            if not self.getsongbpm:
-                return False
-            
-            bpm = self.getsongbpm.get_track_bpm(track.artist, track.name)
-            if bpm:
-                track.bpm = bpm
-                track.bpm_source = "getsongbpm"
-                logger.info(f"Got BPM {track.bpm} for {track.name} via GetSongBPM")
-                return True
-            else:
-                logger.warning(f"No BPM found for {track.name} via GetSongBPM")
-                return False
-        except (ExternalAPIError, BPMAnalysisError) as e:
-            logger.error(f"GetSongBPM BPM lookup failed for {track.name}: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Unexpected error in GetSongBPM BPM lookup for {track.name}: {e}")
-            return False
+        if not self.getsongbpm:
+            return None
+        match = self.getsongbpm.search_track_bpm(track.artist, track.name)
+        return self._getsongbpm_result(track, match)
+    
+    @_fallback_lookup("GetSongBPM")
+    async def _alookup_getsongbpm_bpm(self, track: Track) -> Optional[BPMResult]:
+        """Get BPM using GetSongBPM API without blocking the event loop"""
+        if not self.getsongbpm:
+            return None
+        match = await self.getsongbpm.asearch_track_bpm(track.artist, track.name)
+        return self._getsongbpm_result(track, match)
+    
+    def _getsongbpm_result(self, track: Track, match: Optional[BPMMatch]) -> Optional[BPMResult]:
+        """Race result of a GetSongBPM search"""
+        if not match:
+            logger.warning(f"No BPM found for {track.name} via GetSongBPM")
+            return None
+        return match['bpm'], match['matched']
 
     def get_artist_genres(self, track: Track) -> bool:
         """Get genres from track's artist"""
         try:
-            # Get first artist's genres
-            results = self.sp.search(q=f"artist:{track.artist}", type="artist", limit=1)
-            
-            if (results and 
-                'artists' in results and 
-                results['artists'] and 
-                'items' in results['artists'] and 
-                results['artists']['items']):
-                
-                artist = results['artists']['items'][0]
-                track.genres = artist['genres']
-                return True
+            genres = self._search_artist_genres(track.artist)
         except Exception as e:
             raise GenreAnalysisError(f"Failed to get genres for {track.artist}: {e}")
-        return False
+        
+        if genres is None:
+            return False
+        track.genres = genres
+        return True
+    
+    @cached('genres', ttl=GENRE_CACHE_TTL)
+    def _search_artist_genres(self, artist_name: str) -> Optional[List[str]]:
+        """Genres of the best Spotify match for an artist, or None if no artist matches"""
+        # Get first artist's genres
+        results = self.sp.search(q=f"artist:{artist_name}", type="artist", limit=1)
+        
+        if (results and 
+            'artists' in results and 
+            results['artists'] and 
+            'items' in results['artists'] and 
+            results['artists']['items']):
+            
+            artist = results['artists']['items'][0]
+            return artist['genres']
+        return None
     
     def analyze_track(self, track: Track) -> Track:
-        """Analyze a track - get BPM and genres with fallback support"""
+        """Analyze a track - get BPM and genres with fallback support, blocking; public API"""
         print(f"🔍 Analyzing: {track.name}")
         
         # Try to get BPM with fallback
@@ -144,30 +287,123 @@ class MusicAnalyzer:
         
         return track
     
-    def analyze_tracks(self, tracks: List[Track]) -> List[Track]:
-        """Analyze multiple tracks with progress reporting"""
+    async def get_bpm_with_fallback_async(self, track: Track) -> bool:
+        """Async variant of get_bpm_with_fallback"""
+        if track.bpm is not None:
+            return True
+        
+        logger.info(f"Skipping Spotify BPM (disabled), trying fallback sources for {track.name}")
+        
+        # Query the fallback sources concurrently and keep the first confident BPM found
+        tasks: Dict[asyncio.Task, str] = {
+            asyncio.create_task(alookup(track)): source for source, _, alookup in self._bpm_lookups()
+        }
+        race = _BPMRace()
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if race.offer(tasks[task], task.result()):
+                        return self._finish_race(track, race)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return self._finish_race(track, race)
+    
+    async def analyze_track_async(self, track: Track) -> Track:
+        """Async variant of analyze_track"""
+        print(f"🔍 Analyzing: {track.name}")
+        
+        try:
+            bpm_success = await self.get_bpm_with_fallback_async(track)
+            if not bpm_success:
+                logger.warning(f"Could not get BPM for {track.name} from any source")
+        except (SpotifyQuotaExceededError, BPMAnalysisError) as e:
+            logger.error(f"BPM analysis failed for {track.name}: {e}")
+            # Continue with genre analysis even if BPM fails
+        
+        # spotipy is synchronous, run it off the event loop
+        if not await asyncio.to_thread(self.get_artist_genres, track):
+            raise GenreAnalysisError(f"No genres found for artist: {track.artist}")
+        
+        return track
+    
+    def analyze_tracks(self, tracks: List[Track],
+                       max_concurrency: int = MAX_CONCURRENT_TRACKS) -> List[Track]:
+        """Analyze multiple tracks concurrently with progress reporting"""
+        return asyncio.run(self.analyze_tracks_async(tracks, max_concurrency))
+    
+    async def analyze_tracks_async(self, tracks: List[Track],
+                                   max_concurrency: int = MAX_CONCURRENT_TRACKS) -> List[Track]:
+        """Analyze multiple tracks concurrently with progress reporting"""
         print(f"🔍 Analyzing {len(tracks)} tracks...")
         
+        if self.use_spotify_features:
+            await asyncio.to_thread(self._prefetch_audio_features, tracks)
+        await asyncio.to_thread(self._prefetch_mbids, tracks)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze_bounded(i: int, track: Track) -> Track:
+            async with semaphore:
+                print(f"  [{i}/{len(tracks)}] Processing: {track.name}")
+                return await self.analyze_track_async(track)
+        
+        try:
+            results = await asyncio.gather(
+                *(analyze_bounded(i, track) for i, track in enumerate(tracks, 1)),
+                return_exceptions=True
+            )
+        finally:
+            if self.acousticbrainz:
+                await self.acousticbrainz.aclose()
+            if self.getsongbpm:
+                await self.getsongbpm.aclose()
+        
         successful_tracks: List[Track] = []
         failed_tracks: List[Tuple[Track, str]] = []
         
-        for i, track in enumerate(tracks, 1):
-            try:
-                print(f"  [{i}/{len(tracks)}] Processing: {track.name}")
-                analyzed_track = self.analyze_track(track)
-                successful_tracks.append(analyzed_track)
-            except Exception as e:
-                logger.error(f"Failed to analyze track {track.name}: {e}")
-                failed_tracks.append((track, str(e)))
-                # Continue with next track
+        # gather preserves input order, so results line up with tracks
+        for track, result in zip(tracks, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to analyze track {track.name}: {result}")
+                failed_tracks.append((track, str(result)))
+            else:
+                successful_tracks.append(result)
+        
+        self._report_results(successful_tracks, failed_tracks)
+        return successful_tracks
+    
+    def _prefetch_audio_features(self, tracks: List[Track]) -> None:
+        """Get Spotify BPM for all tracks up front, fallbacks cover the rest"""
+        try:
+            self.get_audio_features_batch(tracks)
+        except (SpotifyQuotaExceededError, BPMAnalysisError) as e:
+            logger.error(f"Batched Spotify audio features failed: {e}")
+    
+    def _prefetch_mbids(self, tracks: List[Track]) -> None:
+        """Resolve MusicBrainz IDs for all tracks up front in batched searches"""
+        if not self.acousticbrainz:
+            return
         
+        try:
+            self.acousticbrainz.search_mbids_batch(
+                [(track.artist, track.name) for track in tracks if track.bpm is None]
+            )
+        except Exception as e:
+            # Per-track searches still run for anything left unresolved
+            logger.error(f"Batched MBID search failed: {e}")
+    
+    def _report_results(self, successful_tracks: List[Track],
+                        failed_tracks: List[Tuple[Track, str]]) -> None:
+        """Print a summary of an analysis run"""
         print(f"✅ Successfully analyzed {len(successful_tracks)} tracks")
         if failed_tracks:
             print(f"❌ Failed to analyze {len(failed_tracks)} tracks")
             for track, error in failed_tracks[:5]:  # Show first 5 failures
                 print(f"   - {track.name}: {error}")
-        
-        return successful_tracks
     
     def get_fallback_status(self) -> Dict[str, Any]:
         """Get status of fallback services"""
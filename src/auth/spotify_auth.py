@@ -5,7 +5,7 @@ import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import requests
 from typing import Optional
-from config import Config
+from config import get_config
 from src.exceptions.spotify_exceptions import (
     SpotifyConnectionError, 
     SpotifyAuthenticationError
@@ -13,7 +13,7 @@ from src.exceptions.spotify_exceptions import (
 
 class SpotifyAuth:
     def __init__(self) -> None:
-        self.config = Config()
+        self.config = get_config()
         self.config.validate()
         self.sp: Optional[spotipy.Spotify] = None
     
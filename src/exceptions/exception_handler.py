@@ -1,7 +1,8 @@
 """
 Exception handling utilities
 """
-from typing import TYPE_CHECKING
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Mapping, Optional, TypeVar
 from src.exceptions.spotify_exceptions import SpotifyQuotaExceededError, SpotifyConnectionError, SpotifyAuthenticationError
 from src.exceptions.analysis_exceptions import BPMAnalysisError, GenreAnalysisError
 from src.exceptions.track_exceptions import TrackValidationError, TrackParsingError
@@ -9,37 +10,47 @@ from src.exceptions.track_exceptions import TrackValidationError, TrackParsingEr
 if TYPE_CHECKING:
     from src.models.track import Track
 
+_Handler = TypeVar('_Handler')
+
+# Exception type -> user-friendly message, resolved through the error's MRO
+_TRACK_ANALYSIS_MESSAGES: Mapping[type, Callable[['Track', Exception], str]] = MappingProxyType({
+    SpotifyQuotaExceededError: lambda track, error: f"⏳ Quota exceeded for {track.name} - skipping BPM analysis",
+    BPMAnalysisError: lambda track, error: f"⚠️ BPM analysis failed for {track.name}",
+    GenreAnalysisError: lambda track, error: f"⚠️ Genre analysis failed for {track.name}",
+    TrackValidationError: lambda track, error: f"⚠️ Track validation failed for {track.name}: {error}",
+    TrackParsingError: lambda track, error: f"⚠️ Track parsing failed for {track.name}: {error}",
+})
+
+_SPOTIFY_CONNECTION_MESSAGES: Mapping[type, Callable[[Exception], str]] = MappingProxyType({
+    SpotifyAuthenticationError: lambda error: f"❌ Authentication error: {error}",
+    SpotifyConnectionError: lambda error: f"❌ Connection error: {error}",
+})
+
+def _find_handler(handlers: Mapping[type, _Handler], error: Exception) -> Optional[_Handler]:
+    """Handler for the most specific registered class of error, like an isinstance chain"""
+    for cls in type(error).__mro__:
+        handler = handlers.get(cls)
+        if handler is not None:
+            return handler
+    return None
+
 class ExceptionHandler:
     """Centralized exception handling"""
     
+    __slots__ = ()
+    
     @staticmethod
     def handle_track_analysis(track: 'Track', error: Exception) -> str:
         """Handle track analysis exceptions and return user-friendly message"""
-        
-        if isinstance(error, SpotifyQuotaExceededError):
-            return f"⏳ Quota exceeded for {track.name} - skipping BPM analysis"
-        
-        elif isinstance(error, BPMAnalysisError):
-            return f"⚠️ BPM analysis failed for {track.name}"
-        
-        elif isinstance(error, GenreAnalysisError):
-            return f"⚠️ Genre analysis failed for {track.name}"
-        
-        elif isinstance(error, TrackValidationError):
-            return f"⚠️ Track validation failed for {track.name}: {error}"
-        
-        elif isinstance(error, TrackParsingError):
-            return f"⚠️ Track parsing failed for {track.name}: {error}"
-        
-        else:
+        handler = _find_handler(_TRACK_ANALYSIS_MESSAGES, error)
+        if handler is None:
             return f"❌ Unexpected error analyzing {track.name}: {error}"
+        return handler(track, error)
     
     @staticmethod
     def handle_spotify_connection(error: Exception) -> str:
         """Handle Spotify connection errors"""
-        if isinstance(error, SpotifyAuthenticationError):
-            return f"❌ Authentication error: {error}"
-        elif isinstance(error, SpotifyConnectionError):
-            return f"❌ Connection error: {error}"
-        else:
+        handler = _find_handler(_SPOTIFY_CONNECTION_MESSAGES, error)
+        if handler is None:
             return f"❌ Error fetching tracks: {error}"
+        return handler(error)
@@ -2,10 +2,10 @@
 Track data model
 """
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from src.exceptions.track_exceptions import TrackValidationError
 
-@dataclass
+@dataclass(slots=True)
 class Track:
     """Represents a music track with its metadata"""
     id: str
@@ -21,21 +21,47 @@ class Track:
         if self.genres is None:
             self.genres = []
         
-        # Validate required fields
-        if not self.id or not self.id.strip():
-            raise TrackValidationError("Track ID cannot be empty")
-        
-        if not self.name or not self.name.strip():
-            raise TrackValidationError("Track name cannot be empty")
-        
-        if not self.artist or not self.artist.strip():
-            raise TrackValidationError("Track artist cannot be empty")
-        
-        if not self.uri or not self.uri.strip():
-            raise TrackValidationError("Track URI cannot be empty")
+        self._validate_structure()
+    
+    @classmethod
+    def from_user_input(cls, **fields: Any) -> 'Track':
+        """Create a track from untrusted input, also rejecting whitespace-only fields"""
+        track = cls(**fields)
+        track._validate_content()
+        return track
+    
+    def _validate_structure(self) -> None:
+        """Cheap checks run for every track, Spotify data included"""
+        if not (self.id and self.name and self.artist and self.uri):
+            # Only the failure path works out which field is missing
+            for label, value in self._required_fields():
+                if not value:
+                    raise TrackValidationError(f"Track {label} cannot be empty")
         
-        if self.popularity < 0 or self.popularity > 100:
+        if not 0 <= self.popularity <= 100:
             raise TrackValidationError("Track popularity must be between 0 and 100")
     
+    def _validate_content(self) -> None:
+        """Stricter checks for user-provided values"""
+        for label, value in self._required_fields():
+            if not value.strip():
+                raise TrackValidationError(f"Track {label} cannot be empty")
+    
+    def _required_fields(self) -> Tuple[Tuple[str, str], ...]:
+        """Required string fields with their labels for error messages"""
+        return (("ID", self.id), ("name", self.name), ("artist", self.artist), ("URI", self.uri))
+    
     def __str__(self) -> str:
         return f"{self.artist} - {self.name}"
+    
+    def summary(self) -> str:
+        """Multi-line description of the track and its analysis results"""
+        source = f" (from {self.bpm_source})" if self.bpm_source else ""
+        genres = ', '.join(self.genres) if self.genres else 'None'
+        return (
+            f"{self}\n"
+            f"   ID: {self.id}\n"
+            f"   Popularity: {self.popularity}\n"
+            f"   BPM: {self.bpm}{source}\n"
+            f"   Genres: {genres}"
+        )
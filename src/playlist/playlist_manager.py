@@ -3,12 +3,17 @@ Spotify playlist management utilities
 """
 import spotipy
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List, Optional
 from src.models.track import Track
 from src.exceptions.spotify_exceptions import SpotifyConnectionError
 
 logger = logging.getLogger(__name__)
 
+# Playlist append requests in flight at once when order doesn't matter
+MAX_CONCURRENT_ADDS = 4
+
 class PlaylistManager:
     def __init__(self, spotify_client: spotipy.Spotify):
         self.sp = spotify_client
@@ -39,8 +44,16 @@ class PlaylistManager:
             logger.error(f"Failed to create playlist '{name}': {e}")
             raise SpotifyConnectionError(f"Failed to create playlist: {e}")
     
-    def add_tracks_to_playlist(self, playlist_id: str, track_uris: List[str]) -> bool:
-        """Add tracks to a playlist"""
+    def add_tracks_to_playlist(self, playlist_id: str, track_uris: List[str], ordered: bool = True) -> bool:
+        """
+        Add tracks to a playlist
+        
+        Args:
+            playlist_id: Spotify playlist ID
+            track_uris: Track URIs to append
+            ordered: Keep track_uris order in the playlist; when False, batches
+                are sent concurrently and may land in any order
+        """
         try:
             if not track_uris:
                 logger.warning("No tracks to add to playlist")
@@ -48,10 +61,18 @@ class PlaylistManager:
             
             # Spotify allows max 100 tracks per request
             batch_size = 100
-            for i in range(0, len(track_uris), batch_size):
-                batch = track_uris[i:i + batch_size]
-                self.sp.playlist_add_items(playlist_id, batch)
-                logger.info(f"Added {len(batch)} tracks to playlist (batch {i//batch_size + 1})")
+            batches = [track_uris[i:i + batch_size] for i in range(0, len(track_uris), batch_size)]
+            
+            if ordered or len(batches) == 1:
+                for number, batch in enumerate(batches, 1):
+                    self.sp.playlist_add_items(playlist_id, batch)
+                    logger.info(f"Added {len(batch)} tracks to playlist (batch {number})")
+            else:
+                # Spotify keeps order within a request, not across concurrent ones
+                with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ADDS) as executor:
+                    add_batch = partial(self.sp.playlist_add_items, playlist_id)
+                    for number, _ in enumerate(executor.map(add_batch, batches), 1):
+                        logger.info(f"Added batch {number} of {len(batches)} to playlist")
             
             logger.info(f"Successfully added {len(track_uris)} tracks to playlist")
             return True
@@ -62,26 +83,24 @@ class PlaylistManager:
     
     def filter_tracks_by_bpm(self, tracks: List[Track], min_bpm: float, max_bpm: float) -> List[Track]:
         """Filter tracks by BPM range"""
-        filtered = []
-        for track in tracks:
-            if track.bpm is not None and min_bpm <= track.bpm <= max_bpm:
-                filtered.append(track)
+        # Scan the current BPMs on every call, so tracks re-analyzed in place are never stale
+        filtered = [
+            track for track in tracks
+            if track.bpm is not None and min_bpm <= track.bpm <= max_bpm
+        ]
         
         logger.info(f"Filtered {len(filtered)} tracks from {len(tracks)} by BPM range {min_bpm}-{max_bpm}")
         return filtered
     
     def filter_tracks_by_genre(self, tracks: List[Track], genre_keyword: str) -> List[Track]:
         """Filter tracks by genre keyword (case-insensitive partial match)"""
-        filtered = []
         genre_keyword_lower = genre_keyword.lower()
         
-        for track in tracks:
-            if track.genres:
-                # Check if any genre contains the keyword
-                for genre in track.genres:
-                    if genre_keyword_lower in genre.lower():
-                        filtered.append(track)
-                        break
+        # Scan the current genres on every call, stopping at each track's first match
+        filtered = [
+            track for track in tracks
+            if any(genre_keyword_lower in genre.lower() for genre in track.genres or ())
+        ]
         
         logger.info(f"Filtered {len(filtered)} tracks from {len(tracks)} by genre keyword '{genre_keyword}'")
         return filtered
@@ -90,16 +109,22 @@ class PlaylistManager:
                              min_bpm: Optional[float] = None, 
                              max_bpm: Optional[float] = None,
                              genre_keyword: Optional[str] = None) -> List[Track]:
-        """Filter tracks by multiple criteria"""
-        filtered = tracks.copy()
-        
-        # Apply BPM filter if specified
-        if min_bpm is not None and max_bpm is not None:
-            filtered = self.filter_tracks_by_bpm(filtered, min_bpm, max_bpm)
+        """Filter tracks by multiple criteria, returning tracks itself when none apply"""
+        # BPM applies only with both bounds, genre only with a non-empty keyword
+        bpm_range = (min_bpm, max_bpm) if min_bpm is not None and max_bpm is not None else None
+        keyword = genre_keyword.lower() if genre_keyword else None
         
-        # Apply genre filter if specified
-        if genre_keyword:
-            filtered = self.filter_tracks_by_genre(filtered, genre_keyword)
+        if bpm_range is None and keyword is None:
+            filtered = tracks
+        else:
+            # One pass; the numeric BPM check short-circuits the genre substring scan
+            filtered = [
+                track for track in tracks
+                if (bpm_range is None or
+                    (track.bpm is not None and bpm_range[0] <= track.bpm <= bpm_range[1]))
+                and (keyword is None or
+                     any(keyword in genre.lower() for genre in track.genres or ()))
+            ]
         
         logger.info(f"Combined filtering result: {len(filtered)} tracks from {len(tracks)} original tracks")
         return filtered
@@ -1,8 +1,10 @@
 """
 Test BPM analysis without playlist creation
 """
+import asyncio
 import logging
-from config import Config
+from collections import Counter
+from config import get_config
 from src.auth.spotify_auth import SpotifyAuth
 from src.models.track import Track
 from src.analyzer.music_analyzer import MusicAnalyzer
@@ -16,7 +18,7 @@ def test_bpm_analysis():
     print("🔧 Setting up...")
     
     # Initialize configuration and auth
-    config = Config()
+    config = get_config()
     auth = SpotifyAuth()
     auth.connect()
     sp = auth.get_client()
@@ -38,40 +40,40 @@ def test_bpm_analysis():
     top_tracks = top_tracks_response['items']
     
     print("📝 Parsing tracks...")
-    tracks = []
-    for spotify_track in top_tracks:
-        track = Track(
+    tracks = [
+        Track(
             id=spotify_track['id'],
             name=spotify_track['name'],
             artist=spotify_track['artists'][0]['name'],
             uri=spotify_track['uri'],
             popularity=spotify_track['popularity']
         )
-        tracks.append(track)
+        for spotify_track in top_tracks
+    ]
     
     print("🔍 Analyzing BPM...")
-    analyzed_tracks = analyzer.analyze_tracks(tracks)
+    # Lookups for all tracks overlap, bounded by the analyzer's semaphore
+    analyzed_tracks = asyncio.run(analyzer.analyze_tracks_async(tracks))
     
-    # Show results
+    # Show results, counting BPM sources in the same pass
     print("\n📊 BPM Analysis Results:")
+    bpm_counts: Counter = Counter()
     for track in analyzed_tracks:
         bpm_info = f"BPM: {track.bpm}" if track.bpm else "BPM: Not found"
         source_info = f"(from {track.bpm_source})" if track.bpm_source else ""
         print(f"  • {track.artist} - {track.name}: {bpm_info} {source_info}")
+        if track.bpm is not None:
+            bpm_counts[track.bpm_source] += 1
     
     # Summary
     total_tracks = len(analyzed_tracks)
-    bpm_tracks = [t for t in analyzed_tracks if t.bpm is not None]
-    spotify_bpm = [t for t in bpm_tracks if t.bpm_source == "spotify"]
-    acousticbrainz_bpm = [t for t in bpm_tracks if t.bpm_source == "acousticbrainz"]
-    getsongbpm_bpm = [t for t in bpm_tracks if t.bpm_source == "getsongbpm"] 
        
     print(f"\n📊 Summary:")
     print(f"  Total tracks: {total_tracks}")
-    print(f"  With BPM: {len(bpm_tracks)}")
-    print(f"  From Spotify: {len(spotify_bpm)}")
-    print(f"  From AcousticBrainz: {len(acousticbrainz_bpm)}")
-    print(f"  From GetSongBPM: {len(getsongbpm_bpm)}")
+    print(f"  With BPM: {sum(bpm_counts.values())}")
+    print(f"  From Spotify: {bpm_counts['spotify']}")
+    print(f"  From AcousticBrainz: {bpm_counts['acousticbrainz']}")
+    print(f"  From GetSongBPM: {bpm_counts['getsongbpm']}")
 
 if __name__ == "__main__":
     test_bpm_analysis()
@@ -9,7 +9,7 @@ from typing import List
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from config import Config
+from config import get_config
 from src.auth.spotify_auth import SpotifyAuth
 from src.models.track import Track
 from src.analyzer.music_analyzer import MusicAnalyzer
@@ -25,7 +25,7 @@ def test_playlist_creation():
     print("🧪 Testing playlist creation workflow...")
     
     # Setup
-    config = Config()
+    config = get_config()
     auth = SpotifyAuth()
     auth.connect()
     sp = auth.get_client()
@@ -1,8 +1,12 @@
 """
 Unit tests for Tempo Craft components
 """
+import asyncio
+import io
+import json
+import time
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import sys
 import os
 
@@ -11,6 +15,18 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from src.models.track import Track
 from src.exceptions.track_exceptions import TrackValidationError
+from src.exceptions.analysis_exceptions import BPMAnalysisError, DataNotFoundError, ExternalAPIError
+from src.exceptions.exception_handler import ExceptionHandler
+from src.analyzer._availability import AvailabilityCheck
+from src.analyzer._cache import Cache, MISSING, cached, make_key
+from src.analyzer.acousticbrainz_analyzer import (
+    AcousticBrainzAnalyzer, MAX_BATCH_QUERY_LENGTH, _lowlevel_event_bpm, _scan_lowlevel_events
+)
+from src.analyzer.getsongbpm_analyzer import GetSongBPMAnalyzer
+from src.analyzer.music_analyzer import MusicAnalyzer
+from src.playlist.playlist_manager import PlaylistManager
+from config import Config, get_config
+from user_interface import UserInterface, _parse_number
 
 class TestTrack:
     """Test Track model"""
@@ -56,6 +72,17 @@ class TestTrack:
                 popularity=-5  # Invalid: < 0
             )
     
+    def test_track_from_user_input_rejects_blank_fields(self):
+        """Test whitespace-only fields are rejected for user input"""
+        with pytest.raises(TrackValidationError, match="Track name cannot be empty"):
+            Track.from_user_input(
+                id="test_id",
+                name="   ",
+                artist="Test Artist",
+                uri="spotify:track:test_id",
+                popularity=75
+            )
+    
     def test_track_set_bpm(self):
         """Test setting BPM on track"""
         track = Track(
@@ -71,6 +98,477 @@ class TestTrack:
         
         assert track.bpm == 120.0
         assert track.bpm_source == "spotify"
+    
+    def test_track_uses_slots(self):
+        """Test tracks carry no __dict__ and reject unknown attributes"""
+        track = Track(
+            id="test_id",
+            name="Test Song",
+            artist="Test Artist",
+            uri="spotify:track:test_id",
+            popularity=75
+        )
+        
+        assert not hasattr(track, '__dict__')
+        with pytest.raises(AttributeError):
+            track.bmp_source = "spotify"
+    
+    def test_track_summary(self):
+        """Test analysis summary formatting"""
+        track = Track(
+            id="test_id",
+            name="Test Song",
+            artist="Test Artist",
+            uri="spotify:track:test_id",
+            popularity=75
+        )
+        
+        assert track.summary().splitlines()[-2:] == ["   BPM: None", "   Genres: None"]
+        
+        track.bpm = 120.0
+        track.bpm_source = "acousticbrainz"
+        track.genres = ["rock", "indie"]
+        
+        assert track.summary() == (
+            "Test Artist - Test Song\n"
+            "   ID: test_id\n"
+            "   Popularity: 75\n"
+            "   BPM: 120.0 (from acousticbrainz)\n"
+            "   Genres: rock, indie"
+        )
+
+class TestExceptionHandler:
+    """Test user-facing error messages"""
+    
+    def test_handle_track_analysis_dispatch(self):
+        """Test messages are picked by exception type, falling back for unknown errors"""
+        track = Track(
+            id="test_id",
+            name="Test Song",
+            artist="Test Artist",
+            uri="spotify:track:test_id",
+            popularity=75
+        )
+        
+        assert ExceptionHandler.handle_track_analysis(track, BPMAnalysisError("x")) == \
+            "⚠️ BPM analysis failed for Test Song"
+        assert ExceptionHandler.handle_track_analysis(track, ExternalAPIError("down")) == \
+            "❌ Unexpected error analyzing Test Song: down"
+
+class TestAcousticBrainzAnalyzer:
+    """Test batched MusicBrainz MBID search and low-level BPM streaming"""
+    
+    def _recordings_response(self, *recordings):
+        """Mocked MusicBrainz search response listing (mbid, artist, title) recordings"""
+        content = json.dumps({'recordings': [
+            {'id': mbid, 'title': title, 'artist-credit': [{'name': artist}]}
+            for mbid, artist, title in recordings
+        ]}).encode()
+        return Mock(content=content)
+    
+    def test_chunk_batch_queries_respects_limits(self):
+        """Test chunks hold at most 33 pairs and stay within the query length budget"""
+        analyzer = AcousticBrainzAnalyzer(probe_availability=False)
+        
+        short_pairs = [(f"A{i}", f"S{i}") for i in range(70)]
+        chunks = analyzer._chunk_batch_queries(short_pairs)
+        assert [len(chunk) for chunk in chunks] == [33, 33, 4]
+        assert [pair for chunk in chunks for pair in chunk] == short_pairs
+        
+        long_pairs = [("A" * 300, f"Song {i}") for i in range(10)]
+        chunks = analyzer._chunk_batch_queries(long_pairs)
+        assert len(chunks) > 1
+        assert [pair for chunk in chunks for pair in chunk] == long_pairs
+        for chunk in chunks:
+            query = ' OR '.join(analyzer._mbid_search_clause(*pair) for pair in chunk)
+            assert len(query) <= MAX_BATCH_QUERY_LENGTH
+    
+    def test_search_mbids_batch_matches_case_insensitively(self):
+        """Test recordings are matched back to the requested pairs ignoring case"""
+        analyzer = AcousticBrainzAnalyzer(probe_availability=False)
+        response = self._recordings_response(
+            ("mbid-1", "daft punk", "ONE MORE TIME"),
+            ("mbid-x", "Someone Else", "Other Song"),
+        )
+        
+        with patch.object(analyzer.session, 'get', return_value=response) as get:
+            found = analyzer.search_mbids_batch([("Daft Punk", "One More Time"), ("Artist", "Missing")])
+            assert found == {("Daft Punk", "One More Time"): "mbid-1"}
+            
+            # Batched matches answer later single lookups without a request
+            assert analyzer.search_mbid_by_track("DAFT PUNK ", "one more time") == "mbid-1"
+        
+        assert get.call_count == 1
+        assert 'OR' in get.call_args.kwargs['params']['query']
+    
+    def test_search_mbids_batch_skips_known_pairs(self):
+        """Test cached and previously batched pairs are left out of the query"""
+        cache = Cache(':memory:')
+        cache.set(make_key('mbid', ("Cached Artist", "Cached Song")), "mbid-cached")
+        analyzer = AcousticBrainzAnalyzer(cache=cache, probe_availability=False)
+        response = self._recordings_response(("mbid-1", "Artist", "Song"))
+        
+        with patch.object(analyzer.session, 'get', return_value=response) as get:
+            analyzer.search_mbids_batch([("Cached Artist", "Cached Song"), ("Artist", "Song")])
+            query = get.call_args.kwargs['params']['query']
+            assert "Cached Artist" not in query and '"Artist"' in query
+            
+            assert analyzer.search_mbids_batch([("artist", "song"), ("Cached Artist", "Cached Song")]) == {}
+        
+        assert get.call_count == 1
+    
+    def test_get_track_bpm_by_mbid_sync_and_async_agree(self):
+        """Test both variants prefer high-level BPMs and raise for missing low-level documents"""
+        analyzer = AcousticBrainzAnalyzer(probe_availability=False)
+        cases = [
+            (((200, {'rhythm': {'bpm': 128.0}}), (200, 90.0)), 128.0),
+            (((200, {'rhythm': {}}), (200, 90.0)), 90.0),
+            (((404, None), (200, None)), None),
+        ]
+        
+        for (highlevel, lowlevel), expected in cases:
+            with patch.object(analyzer, '_fetch_highlevel', return_value=highlevel), \
+                 patch.object(analyzer, '_fetch_lowlevel_bpm', return_value=lowlevel), \
+                 patch.object(analyzer, '_afetch_highlevel', AsyncMock(return_value=highlevel)), \
+                 patch.object(analyzer, '_afetch_lowlevel_bpm', AsyncMock(return_value=lowlevel)):
+                assert analyzer.get_track_bpm_by_mbid("mbid") == expected
+                assert asyncio.run(analyzer.aget_track_bpm_by_mbid("mbid")) == expected
+        
+        with patch.object(analyzer, '_fetch_highlevel', return_value=(404, None)), \
+             patch.object(analyzer, '_fetch_lowlevel_bpm', return_value=(404, None)):
+            with pytest.raises(DataNotFoundError):
+                analyzer.get_track_bpm_by_mbid("mbid")
+    
+    def test_lowlevel_event_bpm_filters_events(self):
+        """Test only plausible rhythm BPM numbers are picked from parse events"""
+        assert _lowlevel_event_bpm('rhythm.bpm', 'number', 128.0) == 128.0
+        assert _lowlevel_event_bpm('rhythm.tempo.mean', 'number', 96.5) == 96.5
+        assert _lowlevel_event_bpm('rhythm.tempo.mean.dmean', 'number', 96.5) is None
+        assert _lowlevel_event_bpm('rhythm.bpm', 'number', 5.0) is None
+        assert _lowlevel_event_bpm('lowlevel.bpm', 'number', 128.0) is None
+        assert _lowlevel_event_bpm('rhythm.bpm', 'string', '128') is None
+    
+    def test_scan_lowlevel_events_finds_bpm_after_large_section(self):
+        """Test the streamed scan reaches rhythm past a large lowlevel section and stops there"""
+        ijson = pytest.importorskip('ijson')
+        document = {
+            'lowlevel': {f'band_{i}': list(range(50)) for i in range(500)},
+            'rhythm': {'beats_count': 400, 'bpm': 123.5},
+            'tonal': {'key_key': 'C'},
+        }
+        events = ijson.parse(io.BytesIO(json.dumps(document).encode()), use_float=True)
+        
+        assert _scan_lowlevel_events(events) == 123.5
+        # Parsing stopped inside rhythm, the rest of the document is still unread
+        assert ('tonal', 'start_map', None) in events
+        
+        no_bpm = json.dumps({'lowlevel': {'x': 1}, 'rhythm': {'beats_count': 400}, 'tonal': {}})
+        assert _scan_lowlevel_events(ijson.parse(io.BytesIO(no_bpm.encode()), use_float=True)) is None
+
+class TestGetSongBPMAnalyzer:
+    """Test GetSongBPM search helpers"""
+    
+    def test_clean_search_term_strips_suffixes(self):
+        """Test version suffixes are removed case-insensitively"""
+        analyzer = GetSongBPMAnalyzer()
+        
+        assert analyzer._clean_search_term("Song - Remastered") == "Song"
+        assert analyzer._clean_search_term("Song  Title - radio edit ") == "Song Title"
+        assert analyzer._clean_search_term("Song - Remix - Extended") == "Song"
+        assert analyzer._clean_search_term("Re-Edit") == "Re-Edit"
+        assert analyzer._clean_search_term("") == ""
+    
+    def test_clean_search_term_strips_versions_and_features(self):
+        """Test year remasters, featured artists and live tags are removed"""
+        analyzer = GetSongBPMAnalyzer()
+        
+        assert analyzer._clean_search_term("Song - 2011 Remaster") == "Song"
+        assert analyzer._clean_search_term("Song - Remastered 2009") == "Song"
+        assert analyzer._clean_search_term("Song (feat. Other Artist)") == "Song"
+        assert analyzer._clean_search_term("Song [Live] (Remastered 2015)") == "Song"
+        assert analyzer._clean_search_term("Live Forever") == "Live Forever"
+    
+    def test_similarity_score_is_order_sensitive(self):
+        """Test reordered words are not scored as a match, with or without rapidfuzz"""
+        analyzer = GetSongBPMAnalyzer()
+        
+        for has_rapidfuzz in (True, False):
+            with patch('src.analyzer.getsongbpm_analyzer.HAS_RAPIDFUZZ', has_rapidfuzz):
+                assert analyzer._similarity_score("abba gold", "gold abba") < 0.7
+                assert analyzer._similarity_score("daft punk", "daft punkk") > 0.7
+    
+    def test_get_track_bpm_caches_misses(self):
+        """Test a lookup without results is answered from the cache next time"""
+        analyzer = GetSongBPMAnalyzer(cache=Cache(':memory:'))
+        response = Mock(status_code=200, content=b'{"search": {"error": "no result"}}')
+        
+        with patch.object(analyzer.session, 'get', return_value=response) as get:
+            assert analyzer.get_track_bpm("Artist", "Song") is None
+            assert analyzer.get_track_bpm("artist", "Song ") is None
+        
+        assert get.call_count == 1
+    
+    def test_search_cache_keyed_on_cleaned_terms(self):
+        """Test versions of a track that clean to the same search share one request"""
+        analyzer = GetSongBPMAnalyzer(cache=Cache(':memory:'))
+        response = Mock(status_code=200, content=b'{"search": {"error": "no result"}}')
+        
+        with patch.object(analyzer.session, 'get', return_value=response) as get:
+            for title in ("Song - Remastered", "Song (Live)", "Song"):
+                assert analyzer.search_track_bpm("Artist", title) is None
+        
+        assert get.call_count == 1
+    
+    def test_search_track_bpm_flags_unverified_first_result(self):
+        """Test the first-result fallback is reported as an unmatched guess"""
+        analyzer = GetSongBPMAnalyzer()
+        content = (b'{"search": [{"title": "Other Song", "tempo": "99",'
+                   b' "artist": {"name": "Someone Else"}}]}')
+        response = Mock(status_code=200, content=content)
+        
+        with patch.object(analyzer.session, 'get', return_value=response):
+            assert analyzer.search_track_bpm("Artist", "Song") == {'bpm': 99.0, 'matched': False}
+            assert analyzer.get_track_bpm("Artist", "Song") == 99.0
+    
+    def test_aclose_drops_loop_bound_limiters(self):
+        """Test each event loop gets its own rate limiter"""
+        analyzer = GetSongBPMAnalyzer()
+        limiters = []
+        
+        async def search():
+            limiters.append(analyzer._get_limiter('getsongbpm'))
+            assert analyzer._get_limiter('getsongbpm') is limiters[-1]
+            await analyzer.aclose()
+        
+        asyncio.run(search())
+        asyncio.run(search())
+        assert limiters[0] is not limiters[1]
+
+class TestMusicAnalyzer:
+    """Test the fallback BPM race"""
+    
+    def _race(self, ab_bpm, gsb_match):
+        """Analyzer whose AcousticBrainz lookup answers after GetSongBPM"""
+        def slow_ab(artist, track_name):
+            time.sleep(0.05)
+            return ab_bpm
+        
+        async def aslow_ab(artist, track_name):
+            await asyncio.sleep(0.05)
+            return ab_bpm
+        
+        acousticbrainz = Mock(get_track_bpm=slow_ab, aget_track_bpm=aslow_ab)
+        getsongbpm = Mock(search_track_bpm=Mock(return_value=gsb_match),
+                          asearch_track_bpm=AsyncMock(return_value=gsb_match))
+        return MusicAnalyzer(Mock(), acousticbrainz, getsongbpm)
+    
+    def _track(self):
+        return Track(id="test_id", name="Test Song", artist="Test Artist",
+                     uri="spotify:track:test_id", popularity=75)
+    
+    def test_unverified_match_does_not_win_race(self):
+        """Test a fast GetSongBPM guess loses to a slower AcousticBrainz BPM, and is used without one"""
+        for use_async in (False, True):
+            for ab_bpm, gsb_match, expected in [
+                (120.0, {'bpm': 99.0, 'matched': False}, (120.0, "acousticbrainz")),
+                (None, {'bpm': 99.0, 'matched': False}, (99.0, "getsongbpm")),
+                (120.0, {'bpm': 99.0, 'matched': True}, (99.0, "getsongbpm")),
+            ]:
+                analyzer = self._race(ab_bpm, gsb_match)
+                track = self._track()
+                
+                if use_async:
+                    assert asyncio.run(analyzer.get_bpm_with_fallback_async(track))
+                else:
+                    assert analyzer.get_bpm_with_fallback(track)
+                assert (track.bpm, track.bpm_source) == expected
+    
+    def test_failed_lookup_counts_as_miss(self):
+        """Test a raising source leaves the race to the others in both variants"""
+        analyzer = self._race(120.0, None)
+        analyzer.getsongbpm.search_track_bpm.side_effect = ExternalAPIError("down")
+        analyzer.getsongbpm.asearch_track_bpm.side_effect = ExternalAPIError("down")
+        
+        for use_async in (False, True):
+            track = self._track()
+            
+            if use_async:
+                assert asyncio.run(analyzer.get_bpm_with_fallback_async(track))
+            else:
+                assert analyzer.get_bpm_with_fallback(track)
+            assert (track.bpm, track.bpm_source) == (120.0, "acousticbrainz")
+
+class TestCache:
+    """Test persistent lookup cache"""
+    
+    def test_cache_roundtrip_and_negative_entries(self):
+        """Test cached None is distinguishable from a miss"""
+        cache = Cache(':memory:')
+        
+        assert cache.get("missing") is MISSING
+        cache.set("negative", None)
+        cache.set("bpm", 120.5)
+        
+        assert cache.get("negative") is None
+        assert cache.get("bpm") == 120.5
+        assert cache.get("bpm", ttl=-1) is MISSING
+    
+    def test_cached_decorator_normalizes_keys(self):
+        """Test decorated lookups hit the cache for equivalent arguments"""
+        class Lookup:
+            def __init__(self):
+                self.cache = Cache(':memory:')
+                self.calls = 0
+            
+            @cached('test')
+            def find(self, artist, track_name):
+                self.calls += 1
+                return None
+        
+        lookup = Lookup()
+        assert lookup.find("Artist", "Song") is None
+        assert lookup.find("  artist ", "SONG") is None
+        assert lookup.calls == 1
+    
+    def test_cached_decorator_replays_negative_exceptions(self):
+        """Test a cached negative exception is raised again instead of turning into None"""
+        class Lookup:
+            def __init__(self):
+                self.cache = Cache(':memory:')
+                self.calls = 0
+            
+            @cached('test', negative=(BPMAnalysisError,))
+            def find(self, mbid):
+                self.calls += 1
+                raise BPMAnalysisError(f"{mbid} not found")
+        
+        lookup = Lookup()
+        for _ in range(2):
+            with pytest.raises(BPMAnalysisError, match="abc not found"):
+                lookup.find("abc")
+        assert lookup.calls == 1
+
+class TestAvailabilityCheck:
+    """Test shared availability probing"""
+    
+    def test_probe_result_reused_until_ttl(self):
+        """Test the probe runs once per ttl window"""
+        probe = Mock(side_effect=[True, False])
+        
+        check = AvailabilityCheck(probe)
+        assert check() is True
+        assert check() is True
+        assert probe.call_count == 1
+        
+        expired = AvailabilityCheck(probe, ttl=-1)
+        assert expired() is False
+        assert probe.call_count == 2
+
+class TestPlaylistManager:
+    """Test track filtering"""
+    
+    def test_filter_tracks_by_bpm_keeps_order(self):
+        """Test BPM range filtering is inclusive, skips unknown BPMs and keeps input order"""
+        tracks = [
+            Track(id=f"id{i}", name=f"Song {i}", artist="Artist", uri=f"spotify:track:id{i}",
+                  popularity=50, bpm=bpm)
+            for i, bpm in enumerate([128.0, None, 100.0, 120.0, 140.0])
+        ]
+        manager = PlaylistManager(Mock())
+        
+        assert manager.filter_tracks_by_bpm(tracks, 100, 128) == [tracks[0], tracks[2], tracks[3]]
+        assert manager.filter_tracks_by_bpm(tracks, 130, 150) == [tracks[4]]
+        assert manager.filter_tracks_by_bpm(tracks[:2], 100, 150) == [tracks[0]]
+        
+        # BPMs changed between calls on the same list are picked up
+        tracks[1].bpm = 110.0
+        tracks[4] = Track(id="new", name="New", artist="Artist", uri="spotify:track:new",
+                          popularity=50, bpm=90.0)
+        assert manager.filter_tracks_by_bpm(tracks, 100, 128) == tracks[:4]
+        assert manager.filter_tracks_by_bpm(tracks, 130, 150) == []
+    
+    def test_filter_tracks_by_genre_partial_match(self):
+        """Test genre filtering matches keyword substrings case-insensitively in input order"""
+        tracks = [
+            Track(id=f"id{i}", name=f"Song {i}", artist="Artist", uri=f"spotify:track:id{i}",
+                  popularity=50, genres=genres)
+            for i, genres in enumerate([["Deep House"], [], ["rock", "house"], ["electronica"]])
+        ]
+        manager = PlaylistManager(Mock())
+        
+        assert manager.filter_tracks_by_genre(tracks, "HOUSE") == [tracks[0], tracks[2]]
+        assert manager.filter_tracks_by_genre(tracks, "tronic") == [tracks[3]]
+        assert manager.filter_tracks_by_genre(tracks, "jazz") == []
+        
+        # Genres changed between calls on the same list are picked up
+        tracks[3].genres[0] = "Jazz"
+        tracks[1] = Track(id="new", name="New", artist="Artist", uri="spotify:track:new",
+                          popularity=50, genres=["house"])
+        assert manager.filter_tracks_by_genre(tracks, "jazz") == [tracks[3]]
+        assert manager.filter_tracks_by_genre(tracks, "house") == tracks[:3]
+    
+    def test_filter_tracks_combined_optional_criteria(self):
+        """Test combined filtering only applies the criteria that are given"""
+        tracks = [
+            Track(id=f"id{i}", name=f"Song {i}", artist="Artist", uri=f"spotify:track:id{i}",
+                  popularity=50, bpm=bpm, genres=genres)
+            for i, (bpm, genres) in enumerate([(120.0, ["House"]), (None, ["house"]), (125.0, ["rock"])])
+        ]
+        manager = PlaylistManager(Mock())
+        
+        assert manager.filter_tracks_combined(tracks, 110, 130, "house") == [tracks[0]]
+        assert manager.filter_tracks_combined(tracks, genre_keyword="HOUSE") == tracks[:2]
+        assert manager.filter_tracks_combined(tracks, 110, 130) == [tracks[0], tracks[2]]
+        assert manager.filter_tracks_combined(tracks) is tracks
+        
+        # Genres edited in place, without changing their count, are matched as they are now
+        tracks[2].genres[0] = "Tech House"
+        assert manager.filter_tracks_combined(tracks, genre_keyword="house") == tracks
+    
+    def test_add_tracks_to_playlist_unordered_sends_all_batches(self):
+        """Test concurrent adds still send every URI in batches of 100"""
+        sp = Mock()
+        uris = [f"spotify:track:id{i}" for i in range(250)]
+        
+        assert PlaylistManager(sp).add_tracks_to_playlist("playlist", uris, ordered=False)
+        
+        batches = [call.args[1] for call in sp.playlist_add_items.call_args_list]
+        assert sorted(len(batch) for batch in batches) == [50, 100, 100]
+        assert sorted(uri for batch in batches for uri in batch) == sorted(uris)
+
+class TestUserInterface:
+    """Test filter input parsing"""
+    
+    def test_get_user_filters_piped_single_line(self):
+        """Test piped one-line filters accept multi-word genres"""
+        with patch('sys.stdin', io.StringIO("Hip Hop 90-100.5\n")):
+            assert UserInterface.get_user_filters() == ("hip hop", 90.0, 100.5)
+    
+    def test_get_user_filters_piped_separate_lines(self):
+        """Test piped answers to each prompt still work"""
+        with patch('sys.stdin', io.StringIO("deep house\n120\n128\n")):
+            assert UserInterface.get_user_filters() == ("deep house", 120.0, 128.0)
+    
+    def test_parse_number(self):
+        """Test plain decimals parse and anything else is rejected without raising"""
+        assert _parse_number(" 120 ") == 120.0
+        assert _parse_number(".5") == 0.5
+        assert _parse_number("-3") == -3.0
+        assert _parse_number("abc") is None
+        assert _parse_number("1e3") is None
+        assert _parse_number("") is None
+
+class TestConfig:
+    """Test configuration loading"""
+    
+    def test_get_config_returns_shared_instance(self):
+        """Test .env is only loaded once per process"""
+        assert get_config() is get_config()
+    
+    def test_getsongbpm_placeholder_key_not_configured(self):
+        """Test the .env.example placeholder does not count as a key"""
+        config = Config(client_id="id", client_secret="secret", getsongbpm_api_key="your_api_key_here")
+        assert not config.has_getsongbpm_config()
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,8 +1,21 @@
 """
 User interface and input handling
 """
+import re
+import sys
 from typing import Tuple, Optional
 
+# Single-line filter form for scripted input, e.g. "techno 120-130" or "hip hop 90-100"
+_FILTER_RE = re.compile(r'^(.+?)\s+(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)$')
+
+# Anything float() accepts for a plain decimal, checked without raising
+_NUMBER_RE = re.compile(r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)')
+
+def _parse_number(text: str) -> Optional[float]:
+    """Parse a decimal number, returning None for invalid input"""
+    text = text.strip()
+    return float(text) if _NUMBER_RE.fullmatch(text) else None
+
 class UserInterface:
     @staticmethod
     def get_user_filters() -> Tuple[str, float, float]:
@@ -10,36 +23,54 @@ class UserInterface:
         print("\n🎛️ Filter Settings")
         print("-" * 30)
         
-        while True:
+        genre_keyword = ""
+        if not sys.stdin.isatty():
+            # Piped input may carry all filters on one line: "genre min-max"
+            line = sys.stdin.readline().strip()
+            match = _FILTER_RE.match(line)
+            if match:
+                genre_keyword = match.group(1).lower()
+                min_bpm, max_bpm = float(match.group(2)), float(match.group(3))
+                if 0 < min_bpm < max_bpm:
+                    return genre_keyword, min_bpm, max_bpm
+                print("Please enter a positive BPM range with maximum above minimum.")
+            else:
+                # Otherwise the line answers the genre prompt
+                genre_keyword = line.lower()
+        
+        while not genre_keyword:
             try:
                 genre_keyword = input("Desired genre (example: rock, pop, techno): ").lower().strip()
-                if genre_keyword:
-                    break
-                print("Please enter a genre keyword.")
+                if not genre_keyword:
+                    print("Please enter a genre keyword.")
             except KeyboardInterrupt:
                 print("\n👋 Goodbye!")
                 exit(0)
         
         while True:
             try:
-                min_bpm = float(input("Minimum BPM: "))
-                if min_bpm > 0:
+                value = _parse_number(input("Minimum BPM: "))
+                if value is None:
+                    print("Please enter a valid number.")
+                elif value > 0:
+                    min_bpm = value
                     break
-                print("Please enter a positive number.")
-            except ValueError:
-                print("Please enter a valid number.")
+                else:
+                    print("Please enter a positive number.")
             except KeyboardInterrupt:
                 print("\n👋 Goodbye!")
                 exit(0)
         
         while True:
             try:
-                max_bpm = float(input("Maximum BPM: "))
-                if max_bpm > min_bpm:
+                value = _parse_number(input("Maximum BPM: "))
+                if value is None:
+                    print("Please enter a valid number.")
+                elif value > min_bpm:
+                    max_bpm = value
                     break
-                print(f"Maximum BPM must be greater than {min_bpm}.")
-            except ValueError:
-                print("Please enter a valid number.")
+                else:
+                    print(f"Maximum BPM must be greater than {min_bpm}.")
             except KeyboardInterrupt:
                 print("\n👋 Goodbye!")
                 exit(0)